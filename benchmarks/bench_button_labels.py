@@ -0,0 +1,90 @@
+"""
+Benchmark for re-rendering labelled buttons.
+
+Compares :func:`arcade.draw_text` per render (previous behaviour) with the retained labels
+of :class:`v2_gui.text.UILabelText`. Buttons are rendered with distinct labels ("Button 1", "Button 2", ...)
+and with one label shared by all buttons. Text is drawn for real, so a window is required.
+Without a display pyglet can run headless with EGL. Run from the repository root::
+
+    python -m benchmarks.bench_button_labels
+    python -m benchmarks.bench_button_labels --headless
+"""
+import argparse
+import time
+
+import pyglet
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--buttons", type=int, default=1_000)
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--headless", action="store_true", help="render without a display")
+    options = parser.parse_args(args)
+
+    if options.headless:
+        pyglet.options["headless"] = True
+
+    # arcade creates pyglet windows on import of the window module
+    import arcade
+    from arcade.gui import Surface
+
+    from benchmarks.headless import solid_texture
+    from simple_button.button_example import UISimpleButton
+    from v2_gui.text import text_cache
+
+    class DrawTextButton(UISimpleButton):
+        """Previous render of UISimpleButton with arcade.draw_text"""
+
+        def do_render(self, surface):
+            self.prepare_render(surface)
+            surface.draw_texture(0, 0, self.width, self.height, self.textures.normal)
+            arcade.draw_text(
+                text=self.text,
+                start_x=self.width // 2,
+                start_y=self.height // 2,
+                font_size=15,
+                color=arcade.color.WHITE,
+                align="center",
+                anchor_x='center', anchor_y='center',
+                width=self.width - 2 * 2 - 2 * 2
+            )
+
+    window = arcade.Window(visible=False)
+    surface = Surface(size=(200, 50))
+    texture = solid_texture("button", size=(200, 50))
+
+    def measure(button_type, labels):
+        text_cache.clear()
+        text_cache.reset_stats()
+        buttons = [button_type(texture=texture, text=label, width=200, height=50) for label in labels]
+
+        def frame():
+            with surface.activate():
+                for button in buttons:
+                    button.do_render(surface)
+            window.ctx.finish()
+
+        # first frame creates the layouts
+        frame()
+        start = time.perf_counter()
+        for _ in range(options.frames):
+            frame()
+        return (time.perf_counter() - start) / options.frames
+
+    print(f"{options.buttons} buttons, time per frame")
+    print(f"{'labels':>10} {'draw_text':>12} {'retained':>12} {'speedup':>8} {'layouts':>8} {'evictions':>10}")
+    for name, labels in (
+            ("distinct", [f"Button {i}" for i in range(options.buttons)]),
+            ("identical", ["Button"] * options.buttons),
+    ):
+        before = measure(DrawTextButton, labels)
+        after = measure(UISimpleButton, labels)
+        print(f"{name:>10} {before * 1e3:>9.2f} ms {after * 1e3:>9.2f} ms {before / after:>7.1f}x "
+              f"{text_cache.misses:>8} {text_cache.evictions:>10}")
+
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Micro-benchmark for content geometry of UIWidgetV2.
+
+Compares cached content geometry with recalculating it on every access (previous behaviour)
+for a tree of 10k widgets. The uncached version allocates a new _Rect for every access. Run from the repository root::
+
+    python -m benchmarks.bench_geometry
+"""
+import time
+
+from arcade.gui.widgets import _Rect
+
+from v2_gui.widget import UIWidgetV2
+
+WIDGETS = 10_000
+# prepare_render, layout and hit testing read the geometry multiple times per frame
+READS_PER_FRAME = 4
+FRAMES = 10
+
+
+def uncached_content_rect(widget: UIWidgetV2):
+    """Content rect calculation without cache, like before"""
+    content_width = widget.rect.width - 2 * widget.border_width - widget.padding_left - widget.padding_right
+    content_height = widget.rect.height - 2 * widget.border_width - widget.padding_top - widget.padding_bottom
+    return _Rect(
+        widget.left + widget.border_width + widget.padding_left,
+        widget.bottom + widget.border_width + widget.padding_bottom,
+        content_width,
+        content_height
+    )
+
+
+def cached_content_rect(widget: UIWidgetV2):
+    return widget.content_rect
+
+
+def build_tree(count=WIDGETS) -> UIWidgetV2:
+    root = UIWidgetV2(width=1000, height=1000)
+    for i in range(count):
+        child = UIWidgetV2(x=i % 100 * 10, y=i // 100 * 10, width=10, height=10)
+        child.with_border(width=1)
+        child.padding = 1
+        root.children.append(child)
+        child.parent = root
+    return root
+
+
+def measure(root: UIWidgetV2, content_rect):
+    widgets = root.children
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for _ in range(READS_PER_FRAME):
+            for widget in widgets:
+                content_rect(widget)
+    duration = time.perf_counter() - start
+
+    return duration / FRAMES
+
+
+def main():
+    root = build_tree()
+    # fill caches, like the first frame would do
+    for widget in root.children:
+        widget.content_rect
+
+    print(f"{WIDGETS} widgets, {READS_PER_FRAME} content_rect reads per widget and frame")
+    results = {}
+    for name, func in (("uncached", uncached_content_rect), ("cached", cached_content_rect)):
+        results[name] = measure(root, func)
+        print(f"{name:>10}: {results[name] * 1000:8.2f} ms/frame")
+
+    print(f"reduction: {1 - results['cached'] / results['uncached']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark for mouse event dispatch of UIWidgetV2 trees with and without UISpatialIndex.
+
+Builds a root with rows of interactive widgets and dispatches mouse motion events
+at random positions. Run from the repository root::
+
+    python -m benchmarks.bench_hit_testing
+"""
+import random
+import time
+
+from arcade.gui import UIDummy
+from arcade.gui.events import UIMouseMovementEvent
+
+from v2_gui.widget import UIWidgetV2
+
+SIZES = (100, 1_000, 10_000)
+EVENTS = 200
+WIDGET_SIZE = 20
+ROW_LENGTH = 100
+
+
+def build_tree(count: int) -> UIWidgetV2:
+    rows = (count + ROW_LENGTH - 1) // ROW_LENGTH
+    root = UIWidgetV2(width=ROW_LENGTH * WIDGET_SIZE, height=rows * WIDGET_SIZE)
+
+    for row_index in range(rows):
+        row = root.add(UIWidgetV2(x=0, y=row_index * WIDGET_SIZE, width=ROW_LENGTH * WIDGET_SIZE, height=WIDGET_SIZE))
+        for column in range(min(ROW_LENGTH, count - row_index * ROW_LENGTH)):
+            row.add(UIDummy(x=column * WIDGET_SIZE, y=row_index * WIDGET_SIZE, width=WIDGET_SIZE, height=WIDGET_SIZE))
+
+    return root
+
+
+def measure(root: UIWidgetV2) -> float:
+    rng = random.Random(42)
+    events = [
+        UIMouseMovementEvent(None, rng.uniform(0, root.width), rng.uniform(0, root.height), 1, 1)
+        for _ in range(EVENTS)
+    ]
+
+    start = time.perf_counter()
+    for event in events:
+        root.dispatch_event("on_event", event)
+    return (time.perf_counter() - start) / EVENTS
+
+
+def main():
+    print(f"{'widgets':>8} {'tree walk':>12} {'spatial index':>14} {'speedup':>8}")
+    for size in SIZES:
+        root = build_tree(size)
+        without_index = measure(root)
+
+        root.enable_spatial_index(cell_size=WIDGET_SIZE * 4)
+        with_index = measure(root)
+
+        print(f"{size:>8} {without_index * 1e6:>9.1f} us {with_index * 1e6:>11.1f} us {without_index / with_index:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark for per-keystroke filter latency of dropdown options.
+
+Types words character by character and filters the options after every keystroke,
+with a linear case-insensitive scan (previous behaviour) and with :class:`v2_gui.option_index.UIOptionIndex`.
+The last column types the word into a filterable, virtualized :class:`dropdown.dropdown_example.UIDropdown`,
+which includes updating the visible rows. Run from the repository root::
+
+    python -m benchmarks.bench_option_filter
+    python -m benchmarks.bench_option_filter --options 10000
+"""
+import argparse
+import random
+import time
+
+from arcade.gui import UITextEvent
+
+from dropdown.dropdown_example import UIDropdown
+from v2_gui.option_index import UIOptionIndex
+
+CATEGORIES = ("tiles", "sprites", "sounds", "fonts", "maps", "ui", "effects", "music")
+MATERIALS = ("stone", "grass", "water", "sand", "wood", "metal", "ice", "lava", "Brick", "Cloud")
+# prefix, substring, rare substring and broad typing sequences
+WORDS = ("tiles_stone_0421", "water", "0421", "e_s", "a")
+
+
+def asset_names(count: int):
+    rng = random.Random(42)
+    return [f"{rng.choice(CATEGORIES)}_{rng.choice(MATERIALS)}_{i:05d}.png" for i in range(count)]
+
+
+def linear_filter(options, query):
+    query = query.casefold()
+    return [option for option in options if query in option.casefold()]
+
+
+def per_key(search, word):
+    """Mean and max latency of filtering after each keystroke"""
+    times = []
+    for end in range(1, len(word) + 1):
+        start = time.perf_counter()
+        search(word[:end])
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times), max(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--options", type=int, default=100_000)
+    options = parser.parse_args(args)
+
+    names = asset_names(options.options)
+
+    start = time.perf_counter()
+    index = UIOptionIndex(names)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    index.build()
+    grams = time.perf_counter() - start
+    print(f"{options.options} options, index built in {build * 1e3:.1f} ms, substring index in {grams * 1e3:.1f} ms")
+
+    dropdown = UIDropdown(default=names[0], options=names, visible_rows=10, filterable=True, width=200, height=30)
+    dropdown._index.build()
+    dropdown._layout.visible = True
+
+    def type_into_dropdown(query):
+        dropdown.dispatch_event("on_event", UITextEvent(None, query[-1]))
+
+    print(f"{'typed':>18} {'linear':>10} {'index':>10} {'max':>10} {'speedup':>8} {'dropdown':>10}")
+    for word in WORDS:
+        linear, _ = per_key(lambda query: linear_filter(names, query), word)
+        # typing starts a new search, like in the dropdown
+        index.search("")
+        indexed, worst = per_key(index.search, word)
+        dropdown.filter_text = ""
+        typed, _ = per_key(type_into_dropdown, word)
+        print(f"{word:>18} {linear * 1e3:>7.2f} ms {indexed * 1e3:>7.2f} ms {worst * 1e3:>7.2f} ms "
+              f"{linear / indexed:>7.1f}x {typed * 1e3:>7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
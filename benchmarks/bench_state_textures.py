@@ -0,0 +1,76 @@
+"""
+Benchmark for the construction of buttons and toggles with eager and lazy state textures.
+
+Each widget gets its own skin, so the shared derived texture cache does not help (worst case).
+Lazy widgets create hover and pressed textures on first render, the warm-up creates all of them
+in one batch afterwards. Run from the repository root::
+
+    python -m benchmarks.bench_state_textures
+"""
+import time
+
+import arcade
+import numpy as np
+from PIL import Image
+
+from simple_button.button_example import UISimpleButton
+from toggle.toggle_example import UIImageToggle
+from v2_gui.textures import derived_textures, warm_up
+
+WIDGETS = 300
+SKIN_SIZE = (128, 64)
+
+
+def create_textures(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    width, height = SKIN_SIZE
+    return [
+        arcade.Texture(f"skin_{seed}_{i}", image=Image.fromarray(rng.integers(0, 256, (height, width, 4), dtype=np.uint8)))
+        for i in range(count)
+    ]
+
+
+def build_buttons(textures, lazy):
+    return [UISimpleButton(texture=texture, text="Button", lazy_textures=lazy) for texture in textures]
+
+
+def build_toggles(textures, lazy):
+    return [
+        UIImageToggle(on_texture=on, off_texture=off, lazy_textures=lazy)
+        for on, off in zip(textures[::2], textures[1::2])
+    ]
+
+
+def measure(build, textures, lazy):
+    derived_textures.clear()
+    start = time.perf_counter()
+    widgets = build(textures, lazy)
+    return widgets, time.perf_counter() - start
+
+
+def state_textures_of(widget):
+    if isinstance(widget, UIImageToggle):
+        return [widget.on_textures, widget.off_textures]
+    return [widget.textures]
+
+
+def main():
+    print(f"{WIDGETS} widgets with distinct {SKIN_SIZE[0]}x{SKIN_SIZE[1]} skins")
+    print(f"{'widget':>16} {'eager':>10} {'lazy':>10} {'warm-up':>10}")
+    for name, build, skins in (
+            ("UISimpleButton", build_buttons, WIDGETS),
+            ("UIImageToggle", build_toggles, WIDGETS * 2),
+    ):
+        textures = create_textures(skins, seed=len(name))
+        _, eager = measure(build, textures, lazy=False)
+        widgets, lazy = measure(build, textures, lazy=True)
+
+        start = time.perf_counter()
+        warm_up(textures for widget in widgets for textures in state_textures_of(widget))
+        warm = time.perf_counter() - start
+
+        print(f"{name:>16} {eager * 1e3:>7.1f} ms {lazy * 1e3:>7.1f} ms {warm * 1e3:>7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark for the creation of state textures (hover, pressed, disabled).
+
+Compares PIL ImageEnhance per texture (previous behaviour) with the batched numpy transforms
+of :func:`v2_gui.textures.transform_images`. Sources are distinct 128x64 skins. Run from the repository root::
+
+    python -m benchmarks.bench_texture_variants
+"""
+import time
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+from v2_gui.textures import STATE_TRANSFORMS, transform_images
+
+SIZES = (1, 100, 1_000)
+SKIN_SIZE = (128, 64)
+
+
+def create_images(count: int):
+    rng = np.random.default_rng(42)
+    width, height = SKIN_SIZE
+    return [
+        Image.fromarray(rng.integers(0, 256, (height, width, 4), dtype=np.uint8), "RGBA")
+        for _ in range(count)
+    ]
+
+
+def image_enhance(images):
+    """hover, pressed and disabled per image with PIL"""
+    for image in images:
+        brightness = ImageEnhance.Brightness(image)
+        brightness.enhance(1.5)
+        brightness.enhance(0.5)
+
+        disabled = ImageEnhance.Color(image).enhance(0)
+        disabled.putalpha(disabled.getchannel("A").point(lambda alpha: alpha // 2))
+
+
+def numpy_batch(images):
+    transform_images(images, list(STATE_TRANSFORMS.values()))
+
+
+def measure(func, images, repeat=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(images)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'textures':>8} {'ImageEnhance':>14} {'numpy batch':>12} {'speedup':>8}")
+    for size in SIZES:
+        images = create_images(size)
+        pil = measure(image_enhance, images)
+        batch = measure(numpy_batch, images)
+        print(f"{size:>8} {pil * 1e3:>11.2f} ms {batch * 1e3:>9.2f} ms {pil / batch:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Checks which options of a :class:`dropdown.dropdown_example.UIDropdown` are styled as selected,
+for options containing the same text more than once. Exactly the selected option has to be highlighted
+after clicks, inserts, removals and changes of the options. Runs without a window::
+
+    python -m benchmarks.check_dropdown_selection
+"""
+import sys
+
+from arcade.gui import UIOnClickEvent, UITextEvent
+
+from dropdown.dropdown_example import UIDropdown
+
+
+def highlighted(buttons):
+    return [position for position, button in enumerate(buttons)
+            if button._style.get("bg_color") == UIDropdown.SELECTED_COLOR]
+
+
+def click(dropdown: UIDropdown, button):
+    dropdown._layout.visible = True
+    button.on_click(UIOnClickEvent(button, 0, 0))
+
+
+def list_checks():
+    dropdown = UIDropdown(default="a", options=["a", "b", "a", "c"], width=100, height=20)
+    yield "default", highlighted(dropdown._option_buttons), [0]
+
+    click(dropdown, dropdown._option_buttons[2])
+    yield "click duplicate", highlighted(dropdown._option_buttons), [2]
+
+    dropdown.insert_option(0, "z")
+    yield "insert before", highlighted(dropdown._option_buttons), [3]
+
+    dropdown.remove_option("z")
+    yield "remove before", highlighted(dropdown._option_buttons), [2]
+
+    dropdown._remove_options(2, 3)
+    yield "remove selected", highlighted(dropdown._option_buttons), [0]
+
+    # the next option with the text moves to the position of the removed one
+    dropdown = UIDropdown(default="a", options=["a", "a", "b"], width=100, height=20)
+    dropdown.remove_option("a")
+    yield "remove selected, duplicate takes position", highlighted(dropdown._option_buttons), [0]
+
+    dropdown = UIDropdown(default="a", options=["a", "a", "c", "a"], width=100, height=20)
+    dropdown.options = ["c", "a", "c"]
+    yield "options setter", highlighted(dropdown._option_buttons), [1]
+
+
+def virtual_checks():
+    dropdown = UIDropdown(default="a", options=["a", "b", "a", "A", "c"], visible_rows=5, filterable=True,
+                          width=100, height=20)
+    rows = dropdown._layout.children
+    yield "virtual default", highlighted(rows), [0]
+
+    click(dropdown, rows[2])
+    yield "virtual click duplicate", highlighted(rows), [2]
+
+    dropdown._layout.visible = True
+    dropdown.dispatch_event("on_event", UITextEvent(None, "a"))
+    # shows a, a, A
+    yield "filtered", highlighted(rows), [1]
+
+    dropdown._close()
+    dropdown.options = ["b", "a", "a"]
+    yield "virtual options setter", highlighted(dropdown._layout.children), [1]
+
+
+def main():
+    failed = False
+    for name, actual, expected in (*list_checks(), *virtual_checks()):
+        ok = actual == expected
+        failed |= not ok
+        print(f"{'ok' if ok else 'FAIL':>4} {name}: highlighted {actual}, expected {expected}")
+
+    if failed:
+        sys.exit("selection styles do not match the selected option")
+
+
+if __name__ == '__main__':
+    main()
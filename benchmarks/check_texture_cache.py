@@ -0,0 +1,94 @@
+"""
+Pixel comparison of subtrees rendered with ``cache_as_texture`` against a plain full render.
+
+Renders a panel with a background, border and a child with a background at several offsets,
+once directly and once through the texture cache, also after the child changed. Reports differing pixels and fails if there are any.
+A window is required, without a display pyglet can run headless with EGL. Run from the repository root::
+
+    python -m benchmarks.check_texture_cache
+    python -m benchmarks.check_texture_cache --headless
+"""
+import argparse
+import sys
+
+import pyglet
+
+OFFSETS = (0, 20, 60)
+
+PANEL_COLOR = (40, 80, 120)
+BORDER_COLOR = (200, 200, 0)
+CHILD_COLOR = (200, 30, 30)
+CHANGED_COLOR = (30, 200, 30)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--headless", action="store_true", help="render without a display")
+    options = parser.parse_args(args)
+
+    if options.headless:
+        pyglet.options["headless"] = True
+
+    # arcade creates pyglet windows on import of the window module
+    import arcade
+    import numpy as np
+
+    from v2_gui.manager import UIManagerV2
+    from v2_gui.widget import UIWidgetV2
+
+    window = arcade.Window(300, 300, visible=False)
+
+    def pixels(manager):
+        fbo = manager._get_surface(0).fbo
+        return np.frombuffer(fbo.read(components=4), dtype=np.uint8).reshape(fbo.height, fbo.width, 4)
+
+    def render(cached: bool, offset: int):
+        """Pixels of the first frame and of a frame after the child changed"""
+        manager = UIManagerV2()
+        # UIWidget.__init__ ignores unknown keyword arguments, so styles are set as properties.
+        # Padding keeps backgrounds visible around the content UIWidgetV2 draws.
+        panel = UIWidgetV2(x=offset, y=offset, width=120, height=100)
+        panel.with_space_around(8, 8, 8, 8, bg_color=PANEL_COLOR)
+        panel.with_border(3, BORDER_COLOR)
+        panel.cache_as_texture = cached
+        child = panel.add(UIWidgetV2(x=offset + 10, y=offset + 10, width=50, height=30))
+        child.with_space_around(5, 5, 5, 5, bg_color=CHILD_COLOR)
+        manager.add(panel)
+        assert panel.bg_color == PANEL_COLOR and panel.border_width == 3 and panel.border_color == BORDER_COLOR
+        assert child.bg_color == CHILD_COLOR
+
+        manager.draw()
+        first = pixels(manager).copy()
+
+        child.bg_color = CHANGED_COLOR
+        manager.draw()
+        return first, pixels(manager).copy()
+
+    def contains(image, color) -> bool:
+        return bool((image[..., :3] == color).all(axis=2).any())
+
+    failed = False
+    print(f"{'offset':>6} {'first frame':>12} {'after change':>13}")
+    for offset in OFFSETS:
+        full = render(False, offset)
+        # the comparison has to cover backgrounds and borders
+        for image, colors in zip(full, ((PANEL_COLOR, BORDER_COLOR, CHILD_COLOR),
+                                        (PANEL_COLOR, BORDER_COLOR, CHANGED_COLOR))):
+            missing = [color for color in colors if not contains(image, color)]
+            if missing:
+                sys.exit(f"full rendering at offset {offset} does not show {missing}")
+
+        differences = [
+            int((expected != actual).any(axis=2).sum())
+            for expected, actual in zip(full, render(True, offset))
+        ]
+        failed |= any(differences)
+        print(f"{offset:>6} {differences[0]:>12} {differences[1]:>13}")
+
+    window.close()
+    if failed:
+        sys.exit("cached rendering differs from full rendering")
+
+
+if __name__ == '__main__':
+    main()
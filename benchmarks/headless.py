@@ -0,0 +1,93 @@
+"""
+Helpers to run widgets without a window or GPU.
+
+Widgets draw through :class:`StubSurface` and arcade draw functions are replaced
+by no-ops within :func:`no_draw`, so only the CPU side of rendering is measured.
+"""
+from contextlib import contextmanager
+
+import arcade
+from PIL import Image
+
+from v2_gui.geometry_batch import UIGeometryBatch
+from v2_gui.surface import RenderStats
+from v2_gui.text import text_cache
+
+
+class StubBatch(UIGeometryBatch):
+    """Geometry batch which collects vertices, but drops them on flush"""
+
+    def flush(self, surface=None) -> bool:
+        vertices = self.vertex_count
+        if not vertices:
+            return False
+
+        self.submitted_vertices += vertices
+        self.clear()
+        return True
+
+
+class _StubFramebuffer:
+    def __init__(self, size):
+        self.viewport = (0, 0, *size)
+        self.scissor = None
+
+
+class StubSurface:
+    """Provides the parts of :class:`v2_gui.surface.UISurfaceV2` used by widgets while rendering"""
+
+    def __init__(self, size=(1280, 720), pixel_ratio=1.0, stats=None):
+        self.size = size
+        self.pixel_ratio = pixel_ratio
+        self.fbo = _StubFramebuffer(size)
+        self.stats = stats or RenderStats()
+        self.batch = StubBatch()
+
+    def limit(self, x, y, width, height):
+        self.fbo.viewport = (int(x), int(y), int(width), int(height))
+
+    def clear(self, color=(0, 0, 0, 0)):
+        pass
+
+    def draw_texture(self, x, y, width, height, tex, angle=0, alpha=255):
+        pass
+
+    def draw_sprite(self, x, y, width, height, sprite):
+        pass
+
+
+class StubText:
+    """Replaces :class:`arcade.Text`, which requires a window"""
+
+    def __init__(self, text, start_x, start_y, **kwargs):
+        self.value = text
+        self.position = start_x, start_y
+
+    def draw(self):
+        pass
+
+
+@contextmanager
+def no_draw():
+    """Replaces all arcade.draw_* functions with no-ops and arcade.Text with :class:`StubText`"""
+    originals = {name: getattr(arcade, name) for name in dir(arcade) if name.startswith("draw_")}
+    originals["Text"] = arcade.Text
+    for name in originals:
+        setattr(arcade, name, _noop)
+    arcade.Text = StubText
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(arcade, name, func)
+        # shared labels must not keep stubs
+        text_cache.clear()
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def solid_texture(name: str, size=(64, 32), color=(120, 120, 120, 255)) -> arcade.Texture:
+    """Texture without a file, image only, nothing is uploaded to the GPU"""
+    return arcade.Texture(name=name, image=Image.new("RGBA", size, color))
@@ -0,0 +1,303 @@
+"""
+Headless benchmark suite for the widgets of this repository.
+
+Builds synthetic trees of UIWidgetV2, UIDropdown, UIImageToggle, UITextureSlider and UISimpleButton
+and measures construction, layout, render passes, event dispatch and property change storms.
+Rendering uses a :class:`benchmarks.headless.StubSurface`, no window or GPU is required.
+
+Sizes are the approximate number of widgets in a tree (composite widgets like UIDropdown count all their children).
+Run from the repository root::
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --save-baseline
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+With a baseline, results which are slower than the threshold are reported as regressions
+and the suite exits with status 1. Timings depend on the machine, so the baseline is not part of the repository,
+save one on the same machine before making changes.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple
+
+import arcade
+from arcade.gui import UIWidget
+from arcade.gui.events import UIMouseMovementEvent
+
+from benchmarks.headless import StubSurface, no_draw, solid_texture
+from dropdown.dropdown_example import UIDropdown
+from image_slider.slider_example import UITextureSlider
+from simple_button.button_example import UISimpleButton
+from toggle.toggle_example import UIImageToggle
+from v2_gui.widget import UIWidgetV2
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+CELL_WIDTH = 100
+CELL_HEIGHT = 30
+ROW_LENGTH = 50
+SURFACE_SIZE = (1280, 720)
+
+EVENTS = 100
+# share of widgets changed per frame in the incremental render benchmark
+DIRTY_SHARE = 0.01
+
+
+class WidgetKind(NamedTuple):
+    name: str
+    # widgets per instance, including children
+    widgets: int
+    create: Callable[[int, float, float], UIWidget]
+    # changes a property of the instance, the argument is a counter
+    mutate: Callable[[UIWidget, int], None]
+
+
+_textures = {}
+
+
+def _texture(name: str) -> arcade.Texture:
+    if name not in _textures:
+        _textures[name] = solid_texture(name)
+    return _textures[name]
+
+
+def _create_widget_v2(i, x, y):
+    widget = UIWidgetV2(x=x, y=y, width=CELL_WIDTH, height=CELL_HEIGHT)
+    widget.with_space_around(bg_color=arcade.color.GRAY)
+    widget.with_border(width=1)
+    return widget
+
+
+def _mutate_widget_v2(widget, i):
+    widget.bg_color = arcade.color.RED if i % 2 else arcade.color.BLUE
+
+
+OPTIONS = ["Arcade", "Platformer", "Jump and Run"]
+
+
+def _create_dropdown(i, x, y):
+    return UIDropdown(default=OPTIONS[0], options=OPTIONS, x=x, y=y, width=CELL_WIDTH, height=CELL_HEIGHT)
+
+
+def _mutate_dropdown(widget, i):
+    widget.value = OPTIONS[i % len(OPTIONS)]
+
+
+def _create_toggle(i, x, y):
+    return UIImageToggle(x=x, y=y, width=CELL_WIDTH, height=CELL_HEIGHT,
+                         on_texture=_texture("toggle_on"), off_texture=_texture("toggle_off"))
+
+
+def _mutate_toggle(widget, i):
+    widget.value = not widget.value
+
+
+def _create_slider(i, x, y):
+    return UITextureSlider(_texture("slider_bar"), _texture("slider_thumb"),
+                           x=x, y=y, width=CELL_WIDTH, height=CELL_HEIGHT)
+
+
+def _mutate_slider(widget, i):
+    widget.value = i % 100
+
+
+def _create_button(i, x, y):
+    return UISimpleButton(x=x, y=y, width=CELL_WIDTH, height=CELL_HEIGHT, texture=_texture("button"), text=f"Button {i}")
+
+
+def _mutate_button(widget, i):
+    widget.hovered = not widget.hovered
+
+
+KINDS = {
+    kind.name: kind
+    for kind in (
+        WidgetKind("UIWidgetV2", 1, _create_widget_v2, _mutate_widget_v2),
+        # button, option layout and one button per option
+        WidgetKind("UIDropdown", 3 + len(OPTIONS), _create_dropdown, _mutate_dropdown),
+        WidgetKind("UIImageToggle", 1, _create_toggle, _mutate_toggle),
+        WidgetKind("UITextureSlider", 1, _create_slider, _mutate_slider),
+        WidgetKind("UISimpleButton", 1, _create_button, _mutate_button),
+    )
+}
+
+
+def build_tree(kind: WidgetKind, size: int) -> UIWidgetV2:
+    """Root with rows of instances, rows are UIWidgetV2 so culling and damage tracking apply"""
+    count = max(1, size // kind.widgets)
+    rows = (count + ROW_LENGTH - 1) // ROW_LENGTH
+    root = UIWidgetV2(width=ROW_LENGTH * CELL_WIDTH, height=rows * CELL_HEIGHT)
+
+    i = 0
+    for row_index in range(rows):
+        y = row_index * CELL_HEIGHT
+        row = root.add(UIWidgetV2(x=0, y=y, width=ROW_LENGTH * CELL_WIDTH, height=CELL_HEIGHT))
+        for column in range(min(ROW_LENGTH, count - i)):
+            row.add(kind.create(i, column * CELL_WIDTH, y))
+            i += 1
+
+    return root
+
+
+def instances(root: UIWidgetV2) -> List[UIWidget]:
+    return [widget for row in root.children for widget in row.children]
+
+
+def _timed(func: Callable[[], None], repeat: int) -> float:
+    """Fastest of repeated runs in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_kind(kind: WidgetKind, size: int, repeat: int) -> Dict[str, float]:
+    results = {}
+
+    start = time.perf_counter()
+    root = build_tree(kind, size)
+    results["construct"] = time.perf_counter() - start
+
+    widgets = instances(root)
+    surface = StubSurface(size=SURFACE_SIZE)
+    rng = random.Random(42)
+
+    results["layout"] = _timed(root._do_layout, repeat)
+
+    results["render_full"] = _timed(lambda: root._do_render(surface, force=True), repeat)
+
+    dirty = rng.sample(widgets, max(1, int(len(widgets) * DIRTY_SHARE)))
+
+    def render_incremental():
+        for widget in dirty:
+            widget.trigger_render()
+        root._do_render(surface)
+
+    results["render_incremental"] = _timed(render_incremental, repeat)
+
+    events = [
+        UIMouseMovementEvent(None, rng.uniform(0, root.width), rng.uniform(0, root.height), 1, 1)
+        for _ in range(EVENTS)
+    ]
+
+    def dispatch():
+        for event in events:
+            root.dispatch_event("on_event", event)
+
+    results["events"] = _timed(dispatch, repeat) / EVENTS
+
+    counter = iter(range(sys.maxsize))
+
+    def property_storm():
+        # every widget changes, followed by one frame
+        for widget in widgets:
+            kind.mutate(widget, next(counter))
+        root._do_render(surface)
+
+    results["property_storm"] = _timed(property_storm, repeat)
+
+    return results
+
+
+def run(kinds: List[str], sizes: List[int], repeat: int) -> dict:
+    results = []
+    with no_draw():
+        for name in kinds:
+            kind = KINDS[name]
+            for size in sizes:
+                # large trees take long, a single run is precise enough
+                kind_repeat = repeat if size <= 10_000 else 1
+                for benchmark, seconds in run_kind(kind, size, kind_repeat).items():
+                    results.append({"widget": name, "size": size, "benchmark": benchmark, "seconds": seconds})
+                    print(f"{name:>16} {size:>8} {benchmark:>20} {_format(seconds):>12}")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "arcade": arcade.version.VERSION,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Prints the change against the baseline, returns descriptions of regressions"""
+    previous = {
+        (entry["widget"], entry["size"], entry["benchmark"]): entry["seconds"]
+        for entry in baseline["results"]
+    }
+
+    regressions = []
+    print()
+    print(f"{'widget':>16} {'size':>8} {'benchmark':>20} {'baseline':>12} {'current':>12} {'change':>8}")
+    for entry in current["results"]:
+        key = entry["widget"], entry["size"], entry["benchmark"]
+        if key not in previous:
+            continue
+
+        before = previous[key]
+        after = entry["seconds"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = " !"
+            regressions.append(f"{' '.join(map(str, key))}: {_format(before)} -> {_format(after)} ({change:+.0%})")
+        print(f"{key[0]:>16} {key[1]:>8} {key[2]:>20} {_format(before):>12} {_format(after):>12} {change:>+8.0%}{flag}")
+
+    return regressions
+
+
+def _format(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--widgets", nargs="+", choices=sorted(KINDS), default=list(KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest is reported")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare results with a previous run")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {DEFAULT_BASELINE.name}")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline")
+    options = parser.parse_args(args)
+
+    # fail before the measurements, which take a while
+    if options.baseline and not options.baseline.exists():
+        parser.error(f"baseline {options.baseline} not found, create it first with --save-baseline")
+
+    current = run(options.widgets, options.sizes, options.repeat)
+
+    if options.output:
+        options.output.write_text(json.dumps(current, indent=2))
+    if options.save_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps(current, indent=2))
+
+    if options.baseline:
+        regressions = compare(current, json.loads(options.baseline.read_text()), options.threshold)
+        if regressions:
+            print()
+            print(f"{len(regressions)} regressions above {options.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
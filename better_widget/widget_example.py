@@ -1,7 +1,10 @@
 import arcade
 from arcade import Window, View
-from arcade.gui import UIManager, UIOnChangeEvent, UIAnchorWidget, UIBoxLayout, UILabel
+from arcade.gui import UIOnChangeEvent, UIAnchorWidget, UIBoxLayout, UILabel
 
+from v2_gui.assets import asset_loader
+from v2_gui.atlas import build_atlas
+from v2_gui.manager import UIManagerV2
 from v2_gui.widget import UIWidgetV2
 from image_slider.slider_example import UITextureSlider
 from toggle.toggle_example import UIImageToggle
@@ -11,31 +14,29 @@ class MyView(View):
     def __init__(self):
         super().__init__()
 
-        self.mng = UIManager()
+        self.mng = UIManagerV2()
 
         # Add button to UIManager, use UIAnchorWidget defaults to center on screen
         self.dummy = UIWidgetV2()
 
-        bar_tex = arcade.load_texture("SliderBar.png")
-        thumb_tex = arcade.load_texture("SliderThumb.png")
-        self.padding_slider = UITextureSlider(bar_tex, thumb_tex, max_value=30, width=100)
+        # textures are decoded in the background while the widgets are created
+        bar_tex, thumb_tex, on_texture, off_texture = asset_loader.load_all(
+            ["SliderBar.png", "SliderThumb.png", "toggle_green.png", "toggle_red.png"]
+        )
+        self.padding_slider = UITextureSlider(bar_tex, thumb_tex, max_value=30, width=100, integer=True)
 
         @self.padding_slider.event("on_change")
         def update_padding(event: UIOnChangeEvent):
-            self.dummy.padding = int(event.new_value)
+            self.dummy.padding = event.new_value
             print(event.new_value)
 
-        bar_tex = arcade.load_texture("SliderBar.png")
-        thumb_tex = arcade.load_texture("SliderThumb.png")
-        self.border_slider = UITextureSlider(bar_tex, thumb_tex, max_value=30, width=100)
+        self.border_slider = UITextureSlider(bar_tex, thumb_tex, max_value=30, width=100, integer=True)
 
         @self.border_slider.event("on_change")
         def update_slider(event: UIOnChangeEvent):
-            self.dummy.border_width = int(event.new_value)
+            self.dummy.border_width = event.new_value
             print(event.new_value)
 
-        on_texture = arcade.load_texture("toggle_green.png")
-        off_texture = arcade.load_texture("toggle_red.png")
         self.visible_toggle = UIImageToggle(value=True, on_texture=on_texture, off_texture=off_texture, height=20, width=20)
 
         @self.visible_toggle.event("on_change")
@@ -66,6 +67,14 @@ class MyView(View):
             child=box
         ))
 
+    def _build_atlas(self):
+        """Draw all skins from one texture, once they are loaded"""
+        self.mng.atlas = build_atlas(
+            textures=[self.padding_slider.bar, self.padding_slider.thumb, self.border_slider.bar, self.border_slider.thumb],
+            state_textures=[self.visible_toggle.on_textures, self.visible_toggle.off_textures],
+        )
+        print(self.mng.atlas.report())
+
     def on_show_view(self):
         arcade.set_background_color(arcade.color.WHITE)
         self.mng.enable()
@@ -73,6 +82,11 @@ class MyView(View):
     def on_hide_view(self):
         self.mng.disable()
 
+    def on_update(self, delta_time: float):
+        # building the atlas in __init__ would wait for the textures
+        if self.mng.atlas is None and asset_loader.done:
+            self._build_atlas()
+
     def on_draw(self):
         arcade.start_render()
         self.mng.draw()
@@ -80,6 +94,7 @@ class MyView(View):
     def on_key_press(self, symbol: int, modifiers: int):
         print(self.dummy.rect)
         print(self.dummy.content_rect)
+        print(self.mng.stats)
 
     def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int):
         if scroll_y:
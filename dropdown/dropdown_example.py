@@ -1,9 +1,17 @@
-from typing import List
+from collections import Counter
+from difflib import SequenceMatcher
+from itertools import count
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Union
 
 import arcade
 from arcade import Window, View
-from arcade.gui import UIManager, UIBoxLayout, UIFlatButton, UIOnChangeEvent, UIOnClickEvent, UILayout, UILabel
+from arcade.gui import UIManager, UIBoxLayout, UIFlatButton, UIOnChangeEvent, UIOnClickEvent, UILayout, UILabel, \
+    UIEvent, UIMouseScrollEvent, UITextEvent, UITextMotionEvent
+from arcade.gui.widgets import EVENT_HANDLED
+from pyglet.window import key
 
+from v2_gui.option_index import UIOptionIndex
+from v2_gui.option_provider import UIPagedOptions
 from v2_gui.widget import UIWidgetV2
 
 
@@ -14,9 +22,41 @@ class UIBoxLayoutV2(UIWidgetV2, UIBoxLayout):
 
 
 class UIDropdown(UIWidgetV2, UILayout):
+    """
+    Button showing the selected value, which opens a list of all options.
+
+    Option buttons are created once. Selecting a value only restyles the previous and the new selection,
+    changes of :attr:`options` insert and remove buttons for the changed entries.
+
+    With ``visible_rows`` the list is virtualized: it shows at most that many rows, scrolled with the mouse wheel.
+    Only the rows are created as buttons, scrolling assigns other options to them,
+    so opening, scrolling and rendering only depend on the number of rows.
+
+    While the list is open, typing selects the first option starting with the typed text (type-ahead).
+    With ``filterable`` typing filters the list instead, showing options containing the text.
+    Both search a :class:`v2_gui.option_index.UIOptionIndex`, which is updated with the options.
+
+    Instead of a list, options can be a provider fetching pages of options on demand,
+    see :mod:`v2_gui.option_provider`. Providers require ``visible_rows``, rows of pages still loading show
+    :attr:`LOADING_TEXT`. Typing always filters, the provider searches the options.
+    """
+    # option list is placed below the dropdown
+    clip_children = False
+
+    SELECTED_COLOR = (55, 66, 81)
+    OPTION_COLOR = (95, 111, 131)
+    LOADING_TEXT = "..."
+
+    # seconds after which type-ahead starts a new search
+    TYPE_AHEAD_TIMEOUT = 1.0
+    # keys added to the substring index per frame
+    INDEX_KEYS_PER_FRAME = 250
+
     def __init__(self,
                  default: str = None,
-                 options: List[str] = None,
+                 options: Union[List[str], UIPagedOptions, Callable, AsyncIterator] = None,
+                 visible_rows: Optional[int] = None,
+                 filterable: bool = False,
                  style=None,
                  **kwargs):
         if style is None:
@@ -25,8 +65,21 @@ class UIDropdown(UIWidgetV2, UILayout):
         # TODO handle if default value not in options or options empty
         if options is None:
             options = []
-        self._options = options
+        self._paged = self._as_paged(options, visible_rows)
+        self._options = [] if self._paged is not None else list(options)
         self._value = default
+        # position of the selected option, options may contain the same text more than once
+        self._selected = self._position_of(default)
+        self.visible_rows = visible_rows
+        self._scroll_offset = 0
+
+        self.filterable = filterable
+        self._index = UIOptionIndex(self._options)
+        self._filter_text = ""
+        # options matching the filter, None without filter
+        self._shown: Optional[List[str]] = None
+        self._type_ahead = ""
+        self._since_key = 0.0
 
         super().__init__(style=style, **kwargs)
 
@@ -36,7 +89,14 @@ class UIDropdown(UIWidgetV2, UILayout):
 
         self._layout = UIBoxLayoutV2()
         self._layout.visible = False
-        self._update_options()
+
+        if self.virtual:
+            self._update_rows()
+        else:
+            self._layout.insert(0, *(self._create_option(option, position == self._selected)
+                                     for position, option in enumerate(self._options)))
+        # children of the layout, unless a filter is applied
+        self._option_buttons: List[UIFlatButton] = self._layout.children
 
         # add children after super class setup
         self.add(self._default_button)
@@ -50,35 +110,347 @@ class UIDropdown(UIWidgetV2, UILayout):
 
     @value.setter
     def value(self, value):
-        old_value = self._value
+        self._set_value(value, self._position_of(value))
+
+    def _set_value(self, value, position: Optional[int]):
+        old_value, old_position = self._value, self._selected
         self._value = value
+        self._selected = position
         self._default_button.text = self._value
 
-        self._update_options()
+        if self.virtual:
+            self._update_rows()
+        else:
+            self._update_option(old_position)
+            self._update_option(position)
         self.dispatch_event("on_change", UIOnChangeEvent(self, old_value, value))
         self.trigger_render()
 
-    def _update_options(self):
-        # generate options
-        self._layout.clear()
-        for option in self._options:
-            button: UIFlatButton = self._layout.add(
-                UIFlatButton(
-                    text=option,
-                    width=self.width,
-                    height=self.height,
-                    style={"bg_color": (55, 66, 81) if self.value == option else (95, 111, 131)}
-                )
-            )
-            button.on_click = self._on_option_click
+    @property
+    def options(self) -> Union[List[str], UIPagedOptions]:
+        """Copy of the options, or the paged options of a provider"""
+        if self._paged is not None:
+            return self._paged
+        return list(self._options)
+
+    @options.setter
+    def options(self, options: Union[List[str], UIPagedOptions, Callable, AsyncIterator]):
+        """Applies the difference to the current options as inserts and removals of buttons"""
+        self._paged = self._as_paged(options, self.visible_rows)
+        options = [] if self._paged is not None else list(options)
+        if self.virtual:
+            # rows show whatever options are in view, only the index is updated with the difference
+            removed = Counter(self._options)
+            removed.subtract(options)
+            if sum(number for number in removed.values() if number > 0) == len(self._options):
+                # nothing in common, rebuilding is faster
+                self._index.clear()
+                self._index.update(options)
+            else:
+                added = -removed
+                for option, number in removed.items():
+                    for _ in range(number):
+                        self._index.remove(option)
+                self._index.update(added.elements())
+            self._options = options
+            self._selected = self._position_of(self._value)
+            self._show_matches()
+            return
+
+        matcher = SequenceMatcher(a=self._options, b=options, autojunk=False)
+        # apply from the end, so indices of earlier opcodes stay valid
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag in ("delete", "replace"):
+                self._remove_options(i1, i2)
+            if tag in ("insert", "replace"):
+                self._insert_options(i1, options[j1:j2])
+
+    def insert_option(self, index: int, option: str):
+        self._insert_options(index, [option])
+
+    def append_option(self, option: str):
+        self._insert_options(len(self._options), [option])
+
+    def remove_option(self, option: str):
+        index = self._options.index(option)
+        self._remove_options(index, index + 1)
+
+    @staticmethod
+    def _as_paged(options, visible_rows: Optional[int]) -> Optional[UIPagedOptions]:
+        """Paged options of a provider, None for a list of options"""
+        if isinstance(options, UIPagedOptions):
+            paged = options
+        elif callable(options) or hasattr(options, "__anext__"):
+            paged = UIPagedOptions(options)
+        else:
+            return None
+
+        if visible_rows is None:
+            raise ValueError("Options of a provider require visible_rows")
+        return paged
+
+    def _position_of(self, value) -> Optional[int]:
+        """Position of the first option with the value, None if there is none"""
+        try:
+            return self._options.index(value)
+        except ValueError:
+            return None
+
+    def _insert_options(self, index: int, options: List[str]):
+        if self._paged is not None:
+            raise TypeError("Options of a provider can only be changed by the provider")
+        self._options[index:index] = options
+        self._index.update(options)
+
+        if self._selected is not None and self._selected >= index:
+            self._selected += len(options)
+        elif self._selected is None and self._value in options:
+            self._selected = index + options.index(self._value)
+
+        if not self.virtual:
+            buttons = [self._create_option(option, index + offset == self._selected)
+                       for offset, option in enumerate(options)]
+            for button in buttons:
+                button.parent = self._layout
+            self._option_buttons[index:index] = buttons
+        self._show_matches()
+
+    def _remove_options(self, start: int, end: int):
+        for option in self._options[start:end]:
+            self._index.remove(option)
+
+        del self._options[start:end]
+
+        selected = self._selected
+        if selected is not None and selected >= end:
+            self._selected -= end - start
+        selected_removed = selected is not None and start <= selected < end
+        if selected_removed:
+            # another option with the same text takes over, it may move to the same position
+            self._selected = self._position_of(self._value)
+
+        if not self.virtual:
+            children = self._option_buttons
+            for button in children[start:end]:
+                button.parent = None
+            del children[start:end]
+            if selected_removed:
+                self._update_option(self._selected)
+
+        self._show_matches()
+
+    def _create_option(self, option: str, selected=False) -> UIFlatButton:
+        """Button for an option, rows of a virtualized list are created empty"""
+        button = UIFlatButton(
+            text=option,
+            width=self.width,
+            height=self.height,
+            style={"bg_color": self.SELECTED_COLOR if selected else self.OPTION_COLOR}
+        )
+        button.on_click = self._on_option_click
+        return button
+
+    @property
+    def virtual(self) -> bool:
+        return self.visible_rows is not None
+
+    @property
+    def filter_text(self) -> str:
+        """Text the options are filtered by, all options are shown if empty"""
+        return self._filter_text
+
+    @filter_text.setter
+    def filter_text(self, text: str):
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        self._scroll_offset = 0
+        # the value button doubles as filter box
+        self._default_button.text = text or str(self._value)
+        self._show_matches()
+
+    def _show_matches(self):
+        """Shows the options matching the filter, in the order of the index, or all options without filter"""
+        if self._paged is not None:
+            self._paged.query = self._filter_text
+            self._update_rows()
+            return
+
+        self._shown = self._index.search(self._filter_text) if self._filter_text else None
+        if self.virtual:
+            self._update_rows()
+            return
+
+        if self._shown is None:
+            children = self._option_buttons
+        else:
+            buttons: Dict[str, List[UIFlatButton]] = {}
+            for button in self._option_buttons:
+                buttons.setdefault(button.text, []).append(button)
+            children = []
+            for option in dict.fromkeys(self._shown):
+                children.extend(buttons[option])
+
+        self._layout.children = children
+        self._layout.trigger_full_render()
+
+    def _type(self, text: str):
+        if self.filterable or self._paged is not None:
+            self.filter_text += text
+            return
+
+        if self._since_key > self.TYPE_AHEAD_TIMEOUT:
+            self._type_ahead = ""
+        self._type_ahead += text
+        self._since_key = 0.0
+
+        option = self._index.first(self._type_ahead)
+        if option is not None and option != self.value:
+            self.value = option
+            if self.virtual:
+                self.scroll_to(option)
+
+    def scroll_to(self, option: str):
+        """Scrolls a virtualized list, so the option is visible"""
+        index = self._visible_options.index(option)
+        if not self._scroll_offset <= index < self._scroll_offset + self.visible_rows:
+            self.scroll_offset = index
+
+    @property
+    def _visible_options(self) -> Sequence[Optional[str]]:
+        if self._paged is not None:
+            return self._paged
+        return self._options if self._shown is None else self._shown
+
+    def _option_position(self, index: int) -> int:
+        """Position in the options of the visible option at the index of a list of options"""
+        shown = self._shown
+        if shown is None:
+            return index
+
+        # the n-th shown option with a text is the n-th option with it,
+        # the index lists options with the same casefolded text one after another
+        option = shown[index]
+        key = option.casefold()
+        occurrence = 0
+        previous = index - 1
+        while previous >= 0 and shown[previous].casefold() == key:
+            occurrence += shown[previous] == option
+            previous -= 1
+
+        position = -1
+        for _ in range(occurrence + 1):
+            position = self._options.index(option, position + 1)
+        return position
+
+    def _is_selected(self, index: int, option: Optional[str]) -> bool:
+        """Whether the visible option at the index is the selected one"""
+        if option is None or option != self._value:
+            return False
+        # positions of a provider depend on the query, its options are compared by text
+        return self._paged is not None or self._option_position(index) == self._selected
+
+    @property
+    def scroll_offset(self) -> int:
+        """Index of the option shown in the first row of a virtualized list"""
+        return self._scroll_offset
+
+    @scroll_offset.setter
+    def scroll_offset(self, offset: int):
+        offset = max(0, min(int(offset), len(self._visible_options) - self.visible_rows))
+        if offset != self._scroll_offset:
+            self._scroll_offset = offset
+            self._update_rows()
+
+    def _update_rows(self):
+        """Assigns the visible options to the rows of a virtualized list, rows are created or removed as required"""
+        options = self._visible_options
+        rows = self._layout.children
+        row_count = min(self.visible_rows, len(options))
+        if len(rows) > row_count:
+            for row in rows[row_count:]:
+                row.parent = None
+            del rows[row_count:]
+            self._layout.trigger_full_render()
+        elif len(rows) < row_count:
+            self._layout.insert(len(rows), *(self._create_option("") for _ in range(row_count - len(rows))))
+
+        # keep the offset valid after options were removed
+        self._scroll_offset = max(0, min(self._scroll_offset, len(options) - row_count))
+
+        for index, row, option in zip(count(self._scroll_offset), rows,
+                                      options[self._scroll_offset:self._scroll_offset + row_count]):
+            text = self.LOADING_TEXT if option is None else option
+            if row.text != text:
+                row.text = text
+            bg_color = self.SELECTED_COLOR if self._is_selected(index, option) else self.OPTION_COLOR
+            if row._style.get("bg_color") != bg_color:
+                row._style = {**row._style, "bg_color": bg_color}
+                row.trigger_render()
+
+    def on_event(self, event: UIEvent) -> Optional[bool]:
+        if (self.virtual
+                and isinstance(event, UIMouseScrollEvent)
+                and self._layout.visible
+                and self._layout.rect.collide_with_point(event.x, event.y)):
+            self.scroll_offset -= event.scroll_y
+            return EVENT_HANDLED
+
+        if self._layout.visible:
+            if isinstance(event, UITextEvent):
+                self._type(event.text)
+                return EVENT_HANDLED
+            if isinstance(event, UITextMotionEvent) and event.motion == key.MOTION_BACKSPACE and self.filter_text:
+                self.filter_text = self.filter_text[:-1]
+                return EVENT_HANDLED
+
+        return super().on_event(event)
+
+    def on_update(self, dt):
+        self._since_key += dt
+        # show pages fetched by the provider
+        if self._paged is not None and self._paged.poll():
+            self._update_rows()
+        # spread building the substring index over frames
+        if not self._index.built:
+            self._index.build(self.INDEX_KEYS_PER_FRAME)
+
+    def _update_option(self, position: Optional[int]):
+        """Restyles the button of the option at the position after selection changes"""
+        if position is None:
+            return
+
+        button = self._option_buttons[position]
+        bg_color = self.SELECTED_COLOR if position == self._selected else self.OPTION_COLOR
+        if button._style.get("bg_color") != bg_color:
+            button._style = {**button._style, "bg_color": bg_color}
+            button.trigger_render()
 
     def _on_button_click(self, event: UIOnClickEvent):
-        self._layout.visible = not self._layout.visible
+        if self._layout.visible:
+            self._close()
+        else:
+            self._layout.visible = True
 
     def _on_option_click(self, event: UIOnClickEvent):
         source: UIFlatButton = event.source
-        self.value = source.text
+        if self._paged is not None:
+            row = self._layout.children.index(source)
+            if self._paged[self._scroll_offset + row] is None:
+                # page is still loading
+                return
+            self.value = source.text
+        elif self.virtual:
+            row = self._layout.children.index(source)
+            self._set_value(source.text, self._option_position(self._scroll_offset + row))
+        else:
+            self._set_value(source.text, self._option_buttons.index(source))
+        self._close()
+
+    def _close(self):
         self._layout.visible = False
+        self._type_ahead = ""
+        self.filter_text = ""
         # TODO trigger on_change
 
     def do_layout(self):
@@ -104,6 +476,7 @@ class MyView(View):
                 "Platformer",
                 "Jump and Run"
             ],
+            filterable=True,
             height=50,
             width=200
         )
@@ -1,18 +1,59 @@
+from math import ceil, floor
+from typing import Optional, Tuple
+
 import arcade
 from arcade import Window, View, Texture
 from arcade.experimental.uislider import UISlider
 from arcade.experimental.uistyle import UISliderStyle
-from arcade.gui import UIManager, UIAnchorWidget, Surface
+from arcade.gui import UIManager, UIAnchorWidget, Surface, UIEvent, UIMouseDragEvent, UIMouseReleaseEvent, \
+    UIOnChangeEvent, UIOnUpdateEvent
+from arcade.gui._property import _bind
+from pyglet.event import EVENT_UNHANDLED
+
+from v2_gui.assets import TextureLike, resolve_texture
+from v2_gui.surface import clip
 
 
 class UITextureSlider(UISlider):
     """
-    Slider using
+    Slider using a texture for the bar and the thumb.
+
+    Drag events only keep the latest position, which is applied once per frame on update.
+    ``on_change`` is dispatched at most once per frame, or at most every ``change_interval`` seconds,
+    and reports the value before the first and after the last change.
+
+    With ``partial_redraw`` a value change only clears and redraws the area between the old and new thumb position
+    instead of re-rendering all parents. The cleared area becomes transparent, so it is off by default
+    and only suitable if nothing is drawn behind the slider, like a background of a parent.
+
+    With a ``step`` values set by dragging snap to multiples of the step from ``min_value`` or to ``max_value``,
+    ``integer`` snaps to whole numbers and provides ints. Drag events which do not change the snapped value
+    neither render nor dispatch ``on_change``, they are counted in :attr:`suppressed_changes`.
     """
 
-    def __init__(self, bar: Texture, thumb: Texture, **kwargs):
-        self.bar = bar
-        self.thumb = thumb
+    def __init__(self, bar: TextureLike, thumb: TextureLike, change_interval: float = 0, partial_redraw=False,
+                 step: Optional[float] = None, integer=False, **kwargs):
+        # textures which are still loading are waited for on first render
+        self._bar = bar
+        self._thumb = thumb
+        self.change_interval = change_interval
+        self.partial_redraw = partial_redraw
+
+        self.step = step
+        self.integer = integer
+        self.suppressed_changes = 0
+
+        # latest dragged value, applied on update
+        self._drag_value: Optional[float] = None
+        # value at the last dispatched on_change, None if no change is pending
+        self._changed_from: Optional[float] = None
+        self._since_change = 0.0
+
+        # span (left, right) of the last rendered thumb, the damaged area starts there
+        self._drawn_thumb: Optional[Tuple[float, float]] = None
+        self._damage: Optional[Tuple[float, float]] = None
+        self._partial = False
+
         style = UISliderStyle(
             normal_filled_bar=(180, 180, 140),
             hovered_filled_bar=(200, 200, 165),
@@ -21,11 +62,152 @@ class UITextureSlider(UISlider):
 
         super().__init__(style=style, **kwargs)
 
-    def do_render(self, surface: Surface):
-        state = "pressed" if self.pressed else "hovered" if self.hovered else "normal"
+        if partial_redraw:
+            # replaces the full render of UISlider on value changes
+            UISlider.value._get_obs(self).listeners.discard(self.trigger_full_render)
+            _bind(self, "value", self._on_value_change)
+            _bind(self, "hovered", self._on_state_change)
+
+    @property
+    def bar(self) -> Texture:
+        self._bar = resolve_texture(self._bar)
+        return self._bar
+
+    @bar.setter
+    def bar(self, value: TextureLike):
+        self._bar = value
+        self.trigger_render()
+
+    @property
+    def thumb(self) -> Texture:
+        self._thumb = resolve_texture(self._thumb)
+        return self._thumb
+
+    @thumb.setter
+    def thumb(self, value: TextureLike):
+        self._thumb = value
+        self.trigger_render()
+
+    def _add_damage(self, span: Optional[Tuple[float, float]]):
+        if span is None:
+            return
+        if self._partial:
+            span = min(span[0], self._damage[0]), max(span[1], self._damage[1])
+        self._damage = span
+        self._partial = True
+
+    def _on_value_change(self):
+        self._add_damage(self._drawn_thumb)
+        self.trigger_render()
+
+    def _on_state_change(self):
+        # colors of the whole bar change
+        self._add_damage((0, self.width))
+
+    def on_event(self, event: UIEvent) -> Optional[bool]:
+        if isinstance(event, UIOnUpdateEvent):
+            self.dispatch_event("on_update", event.dt)
+            return EVENT_UNHANDLED
+
+        if isinstance(event, UIMouseDragEvent):
+            if self.pressed:
+                value = self._value_at(event.x)
+                pending = self.value if self._drag_value is None else self._drag_value
+                if value == pending:
+                    self.suppressed_changes += 1
+                else:
+                    self._drag_value = value
+            return EVENT_UNHANDLED
 
+        if isinstance(event, UIMouseReleaseEvent) and self.pressed:
+            self._apply_drag()
+            self._dispatch_change()
+
+        return super().on_event(event)
+
+    def _quantize(self, value: float) -> float:
+        if self.step:
+            last_step = self.vmin + floor((self.vmax - self.vmin) / self.step) * self.step
+            if value > (last_step + self.vmax) / 2:
+                # the range is no multiple of the step, the end is reachable by the shorter last step
+                value = self.vmax
+            else:
+                value = min(self.vmin + round((value - self.vmin) / self.step) * self.step, self.vmax)
+        if self.integer:
+            value = int(round(value))
+        return value
+
+    def _value_at(self, x: float) -> float:
+        """Snapped value for a thumb position, like the value_x setter"""
+        padding = self.padding
+        x = min(self.right - padding, max(x, self.x + padding))
+        norm = 0 if self.width == 0 else (x - self.x - padding) / float(self.width - 2 * padding)
+        return self._quantize(min(norm * (self.vmax - self.vmin) + self.vmin, self.vmax))
+
+    @property
+    def norm_value(self):
+        return UISlider.norm_value.fget(self)
+
+    @norm_value.setter
+    def norm_value(self, value):
+        self.value = self._quantize(min(value * (self.vmax - self.vmin) + self.vmin, self.vmax))
+
+    def on_update(self, dt):
+        self._apply_drag()
+
+        self._since_change += dt
+        if self._changed_from is not None and self._since_change >= self.change_interval:
+            self._dispatch_change()
+
+    def _apply_drag(self):
+        if self._drag_value is None:
+            return
+
+        old_value = self.value
+        self.value = self._drag_value
+        self._drag_value = None
+        if self.value != old_value and self._changed_from is None:
+            self._changed_from = old_value
+
+    def _dispatch_change(self):
+        old_value = self._changed_from
+        if old_value is None:
+            return
+
+        self._changed_from = None
+        self._since_change = 0.0
+        if old_value != self.value:
+            self.dispatch_event("on_change", UIOnChangeEvent(self, old_value, self.value))  # type: ignore
+
+    def _do_render(self, surface: Surface, force=False):
+        if force:
+            # parents were rendered, the slider has to be drawn completely
+            self._partial = False
+        super()._do_render(surface, force)
+
+    def _thumb_span(self) -> Tuple[float, float]:
+        left = self.value_x - self.x - self.thumb.width // 4
+        return left, left + self.thumb.width // 2
+
+    def do_render(self, surface: Surface):
         self.prepare_render(surface)
 
+        thumb = self._thumb_span()
+        if self._partial:
+            self._partial = False
+            left = max(0, floor(min(self._damage[0], thumb[0])) - 1)
+            right = min(self.width, ceil(max(self._damage[1], thumb[1])) + 1)
+            with clip(surface, (self.x + left, self.y, right - left, self.height)):
+                surface.clear()
+                self._draw(surface)
+        else:
+            self._draw(surface)
+
+        self._drawn_thumb = thumb
+
+    def _draw(self, surface: Surface):
+        state = "pressed" if self.pressed else "hovered" if self.hovered else "normal"
+
         surface.draw_texture(0, 0, self.width, self.height, self.bar)
 
         # TODO accept constructor params
@@ -59,7 +241,8 @@ class MyView(View):
 
         bar_tex = arcade.load_texture("SliderBar.png")
         thumb_tex = arcade.load_texture("SliderThumb.png")
-        self.button = UITextureSlider(bar_tex, thumb_tex)
+        # nothing is drawn behind the slider
+        self.button = UITextureSlider(bar_tex, thumb_tex, partial_redraw=True)
 
         # Add button to UIManager, use UIAnchorWidget defaults to center on screen
         self.mng.add(UIAnchorWidget(child=self.button))
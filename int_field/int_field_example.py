@@ -1,9 +1,16 @@
+from string import Formatter
+from typing import Optional
+
 import arcade
-from PIL import ImageEnhance
 from arcade import Window, View
-from arcade.gui import UIManager, UIAnchorWidget, Surface, UIInputText, UITextureButton, UIBoxLayout, UIOnChangeEvent
+from arcade.gui import UIManager, UIAnchorWidget, Surface, UIInputText, UITextureButton, UIBoxLayout, UIOnChangeEvent, \
+    UIOnClickEvent
+from arcade.gui.events import UIEvent, UIMousePressEvent, UIMouseReleaseEvent
 from arcade.gui._property import _Property, _bind
-from arcade.gui.widgets import _Rect
+from arcade.gui.widgets import _Rect, EVENT_HANDLED
+
+from v2_gui.assets import TextureLike, resolve_texture
+from v2_gui.textures import UIStateTextures, BUTTON_STATES
 
 
 class BetterUIInputText(UIInputText):
@@ -25,7 +32,7 @@ class BetterUIInputText(UIInputText):
 
     @text.setter
     def text(self, value):
-        old_text = value
+        old_text = self.doc.text
         self.doc.text = value
 
         if self.adjust_size:
@@ -38,18 +45,62 @@ class BetterUIInputText(UIInputText):
         pass
 
 
+def _zero_padded(format: str) -> bool:
+    """Format pads numbers with zeros, like {value:03.0f}"""
+    return any(spec and spec.lstrip("+- ").startswith("0") for _, _, spec, _ in Formatter().parse(format))
+
+
 class BetterUIIntInputText(BetterUIInputText):
-    def __init__(self, value=0, **kwargs):
-        super().__init__(**kwargs)
-        self.value = value
+    """
+    Input field for integers.
+
+    Changes of :attr:`value` are applied on the next update, so any number of changes within a frame
+    result in one text update, one layout and render and one ``on_change`` event with the final value.
+
+    With a fixed width format, texts of equal length are assumed to have equal width (digits of most fonts do),
+    so the size is only adjusted if the length of the text changes.
+    By default zero padded formats are fixed width.
+    """
+
+    def __init__(self, value=0, format="{value:03.0f}", fixed_width=None, **kwargs):
+        self.format = format
+        self.fixed_width = _zero_padded(format) if fixed_width is None else fixed_width
+        self._pending_value: Optional[int] = None
+
+        super().__init__(text=format.format(value=value), **kwargs)
 
     @property
     def value(self) -> int:
+        if self._pending_value is not None:
+            return self._pending_value
         return int(self.text)
 
     @value.setter
     def value(self, value: int):
-        self.text = "{value:03.0f}".format(value=value)
+        self._pending_value = int(value)
+
+    def on_update(self, dt):
+        super().on_update(dt)
+        self.apply_value()
+
+    def apply_value(self):
+        """Applies a pending value change immediately"""
+        value = self._pending_value
+        if value is None:
+            return
+        self._pending_value = None
+
+        old_text = self.doc.text
+        text = self.format.format(value=value)
+        if text == old_text:
+            return
+        self.doc.text = text
+
+        if self.adjust_size and not (self.fixed_width and len(text) == len(old_text)):
+            self.fit_content()
+
+        self.dispatch_event("on_change", UIOnChangeEvent(self, int(old_text), value))
+        self.trigger_full_render()
 
 
 class UISimpleButton(UITextureButton):
@@ -66,7 +117,7 @@ class UISimpleButton(UITextureButton):
                  y: float = 0,
                  width: float = None,
                  height: float = None,
-                 texture: arcade.Texture = None,
+                 texture: TextureLike = None,
                  angle=0,
                  text: str = "",
                  scale: float = None,
@@ -74,11 +125,14 @@ class UISimpleButton(UITextureButton):
                  size_hint_min=None,
                  size_hint_max=None,
                  style=None,
+                 lazy_textures=True,
                  **kwargs):
-        # Generate hover and pressed texture by changing the brightness
-        enhancer = ImageEnhance.Brightness(texture.image)
-        hover_tex = arcade.Texture(name=texture.name + "_brighter", image=enhancer.enhance(1.5))
-        pressed_tex = arcade.Texture(name=texture.name + "_darker", image=enhancer.enhance(0.5))
+        # Hover and pressed texture are brighter and darker variants, shared between buttons.
+        # Lazy variants are created when they are rendered the first time.
+        # The size defaults to the texture size, so a loading texture has to be waited for.
+        if texture is not None and (width is None or height is None or scale is not None):
+            texture = resolve_texture(texture)
+        self.textures = UIStateTextures(texture, BUTTON_STATES, lazy=lazy_textures)
         self.angle = angle
 
         _bind(self, "angle", self.trigger_render())
@@ -90,8 +144,8 @@ class UISimpleButton(UITextureButton):
             height=height,
             text=text,
             texture=texture,
-            texture_hovered=hover_tex,
-            texture_pressed=pressed_tex,
+            texture_hovered=None,
+            texture_pressed=None,
             scale=scale,
             size_hint=size_hint,
             size_hint_min=size_hint_min,
@@ -100,19 +154,80 @@ class UISimpleButton(UITextureButton):
             **kwargs
         )
 
+    @property
+    def texture(self):
+        return self.textures.normal
+
+    @texture.setter
+    def texture(self, value: TextureLike):
+        self.textures = UIStateTextures(value, self.textures.states)
+        self.trigger_render()
+
     def do_render(self, surface: Surface):
         self.prepare_render(surface)
 
-        tex = self._tex
-        if self.pressed and self._tex_pressed:
-            tex = self._tex_pressed
-        elif self.hovered and self._tex_hovered:
-            tex = self._tex_hovered
+        tex = self.textures.normal
+        if self.pressed:
+            tex = self.textures["pressed"]
+        elif self.hovered:
+            tex = self.textures["hover"]
 
         if tex:
             surface.draw_texture(0, 0, self.width, self.height, tex, angle=self.angle)
 
 
+class UIRepeatButton(UISimpleButton):
+    """
+    Button which clicks on press and repeats while it is held down.
+    Repeats start after ``repeat_delay`` seconds and accelerate until ``repeat_min_interval``.
+    """
+
+    def __init__(self,
+                 repeat_delay: float = 0.4,
+                 repeat_interval: float = 0.1,
+                 repeat_min_interval: float = 0.02,
+                 repeat_acceleration: float = 0.85,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.repeat_min_interval = repeat_min_interval
+        self.repeat_acceleration = repeat_acceleration
+
+        self._held = 0.0
+        self._next_repeat = 0.0
+        self._interval = 0.0
+
+    def _click(self):
+        self.dispatch_event("on_click", UIOnClickEvent(self, self.center_x, self.center_y))
+
+    def on_event(self, event: UIEvent) -> Optional[bool]:
+        if isinstance(event, UIMousePressEvent) and self.rect.collide_with_point(event.x, event.y):
+            self.pressed = True
+            self._held = 0.0
+            self._next_repeat = self.repeat_delay
+            self._interval = self.repeat_interval
+            self._click()
+            return EVENT_HANDLED
+
+        if self.pressed and isinstance(event, UIMouseReleaseEvent):
+            # clicked on press already
+            self.pressed = False
+            return EVENT_HANDLED
+
+        return super().on_event(event)
+
+    def on_update(self, dt):
+        if not self.pressed:
+            return
+
+        self._held += dt
+        while self._held >= self._next_repeat:
+            self._click()
+            self._interval = max(self.repeat_min_interval, self._interval * self.repeat_acceleration)
+            self._next_repeat += self._interval
+
+
 class MyView(View):
     def __init__(self):
         super().__init__()
@@ -120,15 +235,16 @@ class MyView(View):
 
         # arrow left, input text, arrow right
         tex = arcade.load_texture("arrow.png")
-        self.left_arrow = UISimpleButton(texture=tex, width=10, height=30)
+        self.left_arrow = UIRepeatButton(texture=tex, width=10, height=30)
         self.input_field = BetterUIIntInputText(
             value=0,
             font_size=20,
             text_color=(58, 46, 38),
             adjust_size=True
         )
-        self.right_arrow = UISimpleButton(texture=tex, width=10, height=30, angle=180)
+        self.right_arrow = UIRepeatButton(texture=tex, width=10, height=30, angle=180)
 
+        # click or hold, changes within a frame are applied at once
         # decrement on left click
         @self.left_arrow.event("on_click")
         def dec(event):
@@ -2,13 +2,25 @@ from typing import Optional, Union
 
 import arcade
 import arcade.gui
-from arcade.gui import UIFlatButton, UIOnClickEvent, UIManager, UIBoxLayout
+from arcade.gui import UIFlatButton, UIOnClickEvent, UIBoxLayout, UIWidget
+
+from v2_gui.geometry_batch import UIGeometry, UIGeometryBatch
 
 INTERFACE_BG_COLOR = (102, 51, 0)
 INTERFACE_BORDER_INT_COLOR = (128, 64, 0)
 INTERFACE_BORDER_EXT_COLOR = (0, 0, 0)
 
 
+def _add_outline(geometry: UIGeometry, center_x, center_y, width, height, color, border_width):
+    """Outline centered on the edges of the rect, like arcade.draw_rectangle_outline"""
+    geometry.add_outline(
+        (center_x - (width + border_width) / 2, center_y - (height + border_width) / 2,
+         width + border_width, height + border_width),
+        border_width,
+        color,
+    )
+
+
 class DropDownMenuButton(UIFlatButton):
     def __init__(self, menu: "Menu", text, callback, **button_options):
         self.menu = menu  # parent menu reference
@@ -47,9 +59,11 @@ class DropDownMenu:
         self.width = self.menu.button.width or 130
         self.x = self.menu.button.x
         self.y = self.menu.button.y - self.height - self.menu_bar.buttons_margin
-        self.manager = UIManager()
+        # rendered by the overlay of the menu bar while the menu is open
         self.menu_box = UIBoxLayout(x=self.x, y=self.y + self.height, vertical=True)
-        self.manager.add(self.menu_box)
+
+        self._frame: Optional[UIGeometry] = None
+        self._frame_key = None
 
     @property
     def menu_bar(self):
@@ -63,14 +77,20 @@ class DropDownMenu:
         self.y = self.menu_box.y
         self.height = self.menu_box.height
 
-    def draw_menu_frame(self):
-        arcade.draw_xywh_rectangle_filled(self.x, self.y, self.width, self.height, INTERFACE_BG_COLOR)
-        arcade.draw_xywh_rectangle_outline(self.x + 1, self.y, self.width, self.height, INTERFACE_BORDER_EXT_COLOR, 2)
-        arcade.draw_xywh_rectangle_outline(self.x + 3, self.y + 2, self.width - 4, self.height - 4, INTERFACE_BORDER_INT_COLOR, 2)
-
-    def draw(self):
-        self.draw_menu_frame()
-        self.manager.draw()
+    @property
+    def frame_geometry(self) -> UIGeometry:
+        """Background and borders, built again only if position, size or the number of buttons changed"""
+        key = (self.x, self.y, self.width, self.height, len(self.menu_box.children))
+        if key != self._frame_key:
+            x, y, width, height = self.x, self.y, self.width, self.height
+            geometry = UIGeometry()
+            geometry.add_rect((x, y, width, height), INTERFACE_BG_COLOR)
+            _add_outline(geometry, x + 1 + width / 2, y + height / 2, width, height, INTERFACE_BORDER_EXT_COLOR, 2)
+            _add_outline(geometry, x + 3 + (width - 4) / 2, y + 2 + (height - 4) / 2, width - 4, height - 4,
+                         INTERFACE_BORDER_INT_COLOR, 2)
+            self._frame = geometry
+            self._frame_key = key
+        return self._frame
 
     def is_mouse_on_top(self, x, y):
         """ Check if the mouse is on top of this menu """
@@ -131,21 +151,17 @@ class Menu:
 
         self.is_open: bool = False
 
-    def draw(self):
-        if self.is_open:
-            self.dropdown.draw()
-
     def add_button(self, text: str, on_click_method, **button_options):
         """ Adds a button to thi menu """
         self.dropdown.add_button(text, on_click_method, **button_options)
 
     def close(self):
-        self.dropdown.manager.disable()
+        self.menu_bar.overlay.hide(self.dropdown.menu_box)
         self.is_open = False
         self.menu_bar.display_menu = None
 
     def open(self):
-        self.dropdown.manager.enable()
+        self.menu_bar.overlay.show(self.dropdown.menu_box)
         self.is_open = True
         self.menu_bar.display_menu = self
 
@@ -160,10 +176,42 @@ class Menu:
         return self.dropdown.is_mouse_on_top(x, y)
 
 
+class MenuOverlay(UIWidget):
+    """
+    Layer of the menu bar showing the dropdown of the open menu, on top of the menu buttons.
+
+    Dropdowns share the manager of the menu bar, so they are rendered to its surface and receive events
+    through its handlers, instead of enabling and disabling a manager per dropdown.
+    Showing and hiding only replaces the single child.
+    """
+
+    def show(self, widget: UIWidget):
+        for child in self.children:
+            child.parent = None
+        self.children[:] = [widget]
+        widget.parent = self
+        self.trigger_full_render()
+
+    def hide(self, widget: UIWidget):
+        if widget in self.children:
+            self.children.clear()
+            widget.parent = None
+            self.trigger_full_render()
+
+    @property
+    def shown(self) -> Optional[UIWidget]:
+        return self.children[0] if self.children else None
+
+
 class MenuBar:
     """
     Currently only horizontal Menu at the top of the screen
     Requires to set a camera.use() after the camera of the game (if the game map uses a camera)
+
+    The menu bar owns the only UIManager, dropdowns of all menus are shown through its :class:`MenuOverlay`.
+    Frames of the bar and the open dropdown are kept as geometry and drawn together with one draw call,
+    which is only uploaded again after the frames changed. :attr:`frame_draw_calls` holds the draw calls
+    the last :meth:`draw` issued for the frames, buttons and dropdowns are drawn by the :attr:`manager`.
     """
 
     def __init__(self, game, window: arcade.Window, height: int = 32,
@@ -187,9 +235,16 @@ class MenuBar:
         self.menu_box = arcade.gui.UIBoxLayout(x=0, y=self.top - buttons_margin, vertical=False)
 
         self.manager.add(self.menu_box)
+        # added last, so the open dropdown receives events first
+        self.overlay = self.manager.add(MenuOverlay())
 
         self.display_menu = None  # holds the menu to display
 
+        self.frame_batch = UIGeometryBatch()
+        self._frame: Optional[UIGeometry] = None
+        self._frame_key = None
+        self.frame_draw_calls = 0
+
     def add_menu(self, text, **button_options):
         menu = Menu(self, text, **button_options)
         self.menus_list.append(menu)
@@ -216,19 +271,29 @@ class MenuBar:
             if self.display_menu is not None:
                 return self.display_menu.is_mouse_on_top(x, y)
 
-    def draw_menu_bar_frame(self):
-        arcade.draw_rectangle_filled(self.centered_x, self.centered_y, self.width, self.height, INTERFACE_BG_COLOR)
-        arcade.draw_rectangle_outline(self.centered_x, self.centered_y - 1, self.width, self.height - 1, INTERFACE_BORDER_EXT_COLOR, 2)
-        arcade.draw_rectangle_outline(self.centered_x, self.centered_y - 1, self.width - 6, self.height - 6, INTERFACE_BORDER_INT_COLOR, 2)
+    @property
+    def frame_geometry(self) -> UIGeometry:
+        """Background and borders, built again only if position, size or the number of menus changed"""
+        key = (self.centered_x, self.centered_y, self.width, self.height, len(self.menus_list))
+        if key != self._frame_key:
+            x, y, width, height = self.centered_x, self.centered_y, self.width, self.height
+            geometry = UIGeometry()
+            geometry.add_rect((x - width / 2, y - height / 2, width, height), INTERFACE_BG_COLOR)
+            _add_outline(geometry, x, y - 1, width, height - 1, INTERFACE_BORDER_EXT_COLOR, 2)
+            _add_outline(geometry, x, y - 1, width - 6, height - 6, INTERFACE_BORDER_INT_COLOR, 2)
+            self._frame = geometry
+            self._frame_key = key
+        return self._frame
 
     def draw(self):
-        self.draw_menu_bar_frame()
+        # frame of the dropdown is drawn below the buttons
+        self.frame_batch.add(self.frame_geometry)
+        if self.display_menu:
+            self.frame_batch.add(self.display_menu.dropdown.frame_geometry)
+        self.frame_draw_calls = int(self.frame_batch.flush())
 
         self.manager.draw()
 
-        if self.display_menu:
-            self.display_menu.draw()
-
 
 if __name__ == '__main__':
     window = arcade.Window()
@@ -1,8 +1,11 @@
 import arcade
-from PIL import ImageEnhance
 from arcade import Window, View
 from arcade.gui import UIManager, UITextureButton, UIAnchorWidget, Surface
 
+from v2_gui.assets import TextureLike, resolve_texture
+from v2_gui.text import UILabelText
+from v2_gui.textures import UIStateTextures, BUTTON_STATES
+
 
 class UISimpleButton(UITextureButton):
     """
@@ -16,18 +19,23 @@ class UISimpleButton(UITextureButton):
                  y: float = 0,
                  width: float = None,
                  height: float = None,
-                 texture: arcade.Texture = None,
+                 texture: TextureLike = None,
                  text: str = "",
                  scale: float = None,
                  size_hint=None,
                  size_hint_min=None,
                  size_hint_max=None,
                  style=None,
+                 lazy_textures=True,
                  **kwargs):
-        # Generate hover and pressed texture by changing the brightness
-        enhancer = ImageEnhance.Brightness(texture.image)
-        hover_tex = arcade.Texture(name=texture.name + "_brighter", image=enhancer.enhance(1.5))
-        pressed_tex = arcade.Texture(name=texture.name + "_darker", image=enhancer.enhance(0.5))
+        # Hover and pressed texture are brighter and darker variants, shared between buttons.
+        # Lazy variants are created when they are rendered the first time.
+        # The size defaults to the texture size, so a loading texture has to be waited for.
+        if texture is not None and (width is None or height is None or scale is not None):
+            texture = resolve_texture(texture)
+        self.textures = UIStateTextures(texture, BUTTON_STATES, lazy=lazy_textures)
+        # layout of the text is kept until text, size or style change
+        self._label = UILabelText()
 
         super().__init__(
             x=x,
@@ -36,8 +44,8 @@ class UISimpleButton(UITextureButton):
             height=height,
             text=text,
             texture=texture,
-            texture_hovered=hover_tex,
-            texture_pressed=pressed_tex,
+            texture_hovered=None,
+            texture_pressed=None,
             scale=scale,
             size_hint=size_hint,
             size_hint_min=size_hint_min,
@@ -46,14 +54,23 @@ class UISimpleButton(UITextureButton):
             **kwargs
         )
 
+    @property
+    def texture(self):
+        return self.textures.normal
+
+    @texture.setter
+    def texture(self, value: TextureLike):
+        self.textures = UIStateTextures(value, self.textures.states)
+        self.trigger_render()
+
     def do_render(self, surface: Surface):
         self.prepare_render(surface)
 
-        tex = self._tex
-        if self.pressed and self._tex_pressed:
-            tex = self._tex_pressed
-        elif self.hovered and self._tex_hovered:
-            tex = self._tex_hovered
+        tex = self.textures.normal
+        if self.pressed:
+            tex = self.textures["pressed"]
+        elif self.hovered:
+            tex = self.textures["hover"]
 
         if tex:
             surface.draw_texture(0, 0, self.width, self.height, tex)
@@ -69,10 +86,10 @@ class UISimpleButton(UITextureButton):
             start_x = self.width // 2
             start_y = self.height // 2
 
-            arcade.draw_text(
+            self._label.draw(
                 text=self.text,
-                start_x=start_x,
-                start_y=start_y,
+                x=start_x,
+                y=start_y,
                 font_size=font_size,
                 color=font_color,
                 align="center",
@@ -1,10 +1,12 @@
 import arcade
-from PIL import ImageEnhance
 from arcade import Window, View
 from arcade.gui import UIManager, UIAnchorWidget, Surface, UIInteractiveWidget, UIOnClickEvent, \
     UIOnChangeEvent
 from arcade.gui._property import _Property, _bind
 
+from v2_gui.assets import TextureLike
+from v2_gui.textures import UIStateTextures, BUTTON_STATES
+
 
 class UIImageToggle(UIInteractiveWidget):
     """
@@ -19,25 +21,20 @@ class UIImageToggle(UIInteractiveWidget):
                  y: float = 0,
                  width: float = 100,
                  height: float = 50,
-                 on_texture: arcade.Texture = None,
-                 off_texture: arcade.Texture = None,
+                 on_texture: TextureLike = None,
+                 off_texture: TextureLike = None,
                  value=False,
                  scale: float = None,
                  size_hint=None,
                  size_hint_min=None,
                  size_hint_max=None,
                  style=None,
+                 lazy_textures=True,
                  **kwargs):
-        # Generate hover and pressed texture by changing the brightness
-        self.normal_on_tex = on_texture
-        enhancer = ImageEnhance.Brightness(self.normal_on_tex.image)
-        self.hover_on_tex = arcade.Texture(name=self.normal_on_tex.name + "_brighter", image=enhancer.enhance(1.5))
-        self.pressed_on_tex = arcade.Texture(name=self.normal_on_tex.name + "_darker", image=enhancer.enhance(0.5))
-
-        self.normal_off_tex = off_texture
-        enhancer = ImageEnhance.Brightness(self.normal_off_tex.image)
-        self.hover_off_tex = arcade.Texture(name=self.normal_off_tex.name + "_brighter", image=enhancer.enhance(1.5))
-        self.pressed_off_tex = arcade.Texture(name=self.normal_off_tex.name + "_darker", image=enhancer.enhance(0.5))
+        # Hover and pressed texture are brighter and darker variants, shared between toggles.
+        # Lazy variants are created when they are rendered the first time.
+        self.on_textures = UIStateTextures(on_texture, BUTTON_STATES, lazy=lazy_textures)
+        self.off_textures = UIStateTextures(off_texture, BUTTON_STATES, lazy=lazy_textures)
 
         self.value = value
         self.register_event_type("on_change")
@@ -66,11 +63,9 @@ class UIImageToggle(UIInteractiveWidget):
 
     def do_render(self, surface: Surface):
         self.prepare_render(surface)
-        tex = self.normal_on_tex if self.value else self.normal_off_tex
-        if self.pressed:
-            tex = self.pressed_on_tex if self.value else self.pressed_off_tex
-        elif self.hovered:
-            tex = self.hover_on_tex if self.value else self.hover_off_tex
+        textures = self.on_textures if self.value else self.off_textures
+        state = "pressed" if self.pressed else "hover" if self.hovered else "normal"
+        tex = textures[state]
         surface.draw_texture(0, 0, self.width, self.height, tex)
 
     def on_change(self, event: UIOnChangeEvent):
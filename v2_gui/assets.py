@@ -0,0 +1,131 @@
+"""
+Loads textures on a thread pool, so building a view overlaps with disk I/O and image decoding.
+
+Requests are de-duplicated by path, loading the same file twice returns the same handle.
+Widgets accept a :class:`TextureHandle` in place of a :class:`arcade.Texture`
+and wait for the texture when they need it the first time, usually on first render.
+
+.. code:: py
+
+    loader = UIAssetLoader()
+    bar_tex = loader.load("SliderBar.png")
+    slider = UITextureSlider(bar_tex, loader.load("SliderThumb.png"))
+
+    # loading screen
+    if not loader.done:
+        draw_progress_bar(loader.progress)
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import arcade
+
+
+class TextureHandle:
+    """Texture which is still loading, :attr:`texture` waits for it"""
+
+    __slots__ = ("path", "future")
+
+    def __init__(self, path: str, future: Future):
+        self.path = path
+        self.future = future
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def texture(self) -> arcade.Texture:
+        """Loaded texture, raises the error of the loader if loading failed"""
+        return self.future.result()
+
+    def add_done_callback(self, callback: Callable[["TextureHandle"], None]):
+        """Calls the callback with this handle after loading, callbacks run in the loader thread"""
+        self.future.add_done_callback(lambda _: callback(self))
+
+    def __repr__(self):
+        state = "done" if self.done() else "loading"
+        return f"<TextureHandle {self.path} {state}>"
+
+
+TextureLike = Union[arcade.Texture, TextureHandle]
+
+
+def resolve_texture(texture: Optional[TextureLike]) -> Optional[arcade.Texture]:
+    """Texture of a handle, waits if it is still loading. Textures and None are returned as they are."""
+    if isinstance(texture, TextureHandle):
+        return texture.texture
+    return texture
+
+
+class UIAssetLoader:
+    """
+    Loads textures with :func:`arcade.load_texture` on a thread pool.
+    Loaded textures end up in arcade's texture cache, later calls of :func:`arcade.load_texture` return them.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._handles: Dict[str, TextureHandle] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        path = str(path)
+        # resource handles like :resources: are not file system paths
+        if path.startswith(":"):
+            return path
+        return str(Path(path).resolve())
+
+    def load(self, path: Union[str, Path]) -> TextureHandle:
+        """Starts loading the texture, returns the existing handle if the path was requested before"""
+        key = self._key(path)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset-loader")
+                handle = TextureHandle(str(path), self._executor.submit(arcade.load_texture, str(path)))
+                self._handles[key] = handle
+        return handle
+
+    def load_all(self, paths: Iterable[Union[str, Path]]) -> List[TextureHandle]:
+        return [self.load(path) for path in paths]
+
+    @property
+    def total(self) -> int:
+        """Number of requested textures"""
+        return len(self._handles)
+
+    @property
+    def loaded(self) -> int:
+        """Number of finished textures, including failed ones"""
+        return sum(1 for handle in list(self._handles.values()) if handle.done())
+
+    @property
+    def progress(self) -> float:
+        """Share of finished textures, 1.0 without requests"""
+        total = self.total
+        return self.loaded / total if total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.loaded == self.total
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits for all requested textures, returns False on timeout"""
+        _, pending = wait([handle.future for handle in list(self._handles.values())], timeout=timeout)
+        return not pending
+
+    def shutdown(self):
+        """Stops the worker threads after pending textures are loaded, handles stay valid"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# process-wide loader, de-duplicates requests across views
+asset_loader = UIAssetLoader()
@@ -0,0 +1,374 @@
+"""
+Texture atlas for widget skins and their state variants.
+
+Packing and region lookup run on the CPU, pages are uploaded to the GPU when they are drawn the first time.
+
+.. code:: py
+
+    builder = UIAtlasBuilder()
+    builder.add_texture(bar_tex)
+    builder.add_state_textures(button.textures)
+    atlas = builder.build()
+    print(atlas.report())
+
+    manager.atlas = atlas  # UISurfaceV2 draws textures contained in the atlas through their region
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import arcade
+from arcade.gl import geometry
+from PIL import Image
+
+from v2_gui.assets import TextureLike, resolve_texture
+from v2_gui.textures import UIStateTextures
+
+
+class AtlasRegion(NamedTuple):
+    """Area of a texture on an atlas page, in pixels with the origin in the top left corner"""
+    page: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def uv(self, page_size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+        """Texture coordinates (left, bottom, right, top) of the region, pages are uploaded bottom up"""
+        page_width, page_height = page_size
+        return (
+            self.x / page_width,
+            (page_height - self.y - self.height) / page_height,
+            (self.x + self.width) / page_width,
+            (page_height - self.y) / page_height,
+        )
+
+
+class SkylinePacker:
+    """
+    Packs rects into a fixed area with the skyline bottom-left heuristic.
+    The skyline is a list of segments (x, y, width), y grows downwards.
+    """
+
+    def __init__(self, width: int, height: int, padding: int = 1):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.used_area = 0
+        self._skyline: List[List[int]] = [[0, 0, width]]
+
+    def _fit(self, index: int, width: int, height: int) -> Optional[int]:
+        """Lowest y at which the rect fits, starting at the given segment"""
+        x = self._skyline[index][0]
+        if x + width > self.width:
+            return None
+
+        y = 0
+        remaining = width
+        while remaining > 0:
+            segment_x, segment_y, segment_width = self._skyline[index]
+            y = max(y, segment_y)
+            if y + height > self.height:
+                return None
+            remaining -= segment_width
+            index += 1
+            if remaining > 0 and index == len(self._skyline):
+                return None
+        return y
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Position (x, y) of the rect, None if it does not fit"""
+        padded_width = width + self.padding
+        padded_height = height + self.padding
+
+        best = None
+        for index in range(len(self._skyline)):
+            y = self._fit(index, padded_width, padded_height)
+            if y is None:
+                continue
+            key = (y + padded_height, self._skyline[index][0])
+            if best is None or key < best[0]:
+                best = key, index, y
+
+        if best is None:
+            return None
+
+        _, index, y = best
+        x = self._skyline[index][0]
+        self._add_level(index, x, y + padded_height, padded_width)
+        self.used_area += width * height
+        return x, y
+
+    def _add_level(self, index: int, x: int, y: int, width: int):
+        skyline = self._skyline
+        skyline.insert(index, [x, y, width])
+
+        # shrink or remove segments covered by the new one
+        right = x + width
+        following = index + 1
+        while following < len(skyline):
+            segment = skyline[following]
+            if segment[0] >= right:
+                break
+            overlap = right - segment[0]
+            if overlap < segment[2]:
+                segment[0] += overlap
+                segment[2] -= overlap
+                break
+            del skyline[following]
+
+        # merge neighbours on the same height
+        merged = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == merged[-1][1]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        self._skyline = merged
+
+    @property
+    def used_height(self) -> int:
+        return max(segment[1] for segment in self._skyline)
+
+
+class UIAtlas:
+    """Packed atlas pages and the region of each texture, identified by texture name"""
+
+    def __init__(self, pages: List[Image.Image], regions: Dict[str, AtlasRegion], used_area: int):
+        self.pages = pages
+        self.regions = regions
+        self.used_area = used_area
+
+        # GPU resources, created on first draw
+        self._textures = None
+        self._program = None
+        self._quad = None
+        self.draw_calls = 0
+
+    def __contains__(self, texture) -> bool:
+        return self._name(texture) in self.regions
+
+    def __len__(self):
+        return len(self.regions)
+
+    @staticmethod
+    def _name(texture) -> str:
+        return texture if isinstance(texture, str) else texture.name
+
+    def region(self, texture) -> Optional[AtlasRegion]:
+        """Region of a texture or texture name, None if the atlas does not contain it"""
+        return self.regions.get(self._name(texture))
+
+    def uv(self, texture) -> Optional[Tuple[float, float, float, float]]:
+        region = self.region(texture)
+        if region is None:
+            return None
+        return region.uv(self.pages[region.page].size)
+
+    @property
+    def total_area(self) -> int:
+        return sum(width * height for width, height in (page.size for page in self.pages))
+
+    @property
+    def usage(self) -> float:
+        """Share of the page area covered by textures"""
+        total = self.total_area
+        return self.used_area / total if total else 0.0
+
+    def report(self) -> str:
+        pages = ", ".join(f"{width}x{height}" for width, height in (page.size for page in self.pages))
+        return f"{len(self.regions)} textures on {len(self.pages)} pages ({pages}), {self.usage:.1%} of the area used"
+
+    # Drawing
+    def _setup(self):
+        ctx = arcade.get_window().ctx
+        self._textures = [
+            ctx.texture(page.size, components=4, data=page.transpose(Image.FLIP_TOP_BOTTOM).tobytes())
+            for page in self.pages
+        ]
+        self._quad = geometry.screen_rectangle(0, 0, 1, 1)
+        self._program = ctx.program(
+            vertex_shader="""
+                #version 330
+
+                uniform Projection {
+                    uniform mat4 matrix;
+                } proj;
+                uniform vec2 pos;
+                uniform vec2 size;
+                uniform vec4 region;
+                uniform float angle;
+
+                in vec2 in_vert;
+                in vec2 in_uv;
+
+                out vec2 uv;
+
+                void main() {
+                    // rotate around the center, counter clockwise in degrees like arcade
+                    vec2 offset = (in_vert - 0.5) * size;
+                    float rad = radians(angle);
+                    offset = vec2(
+                        offset.x * cos(rad) - offset.y * sin(rad),
+                        offset.x * sin(rad) + offset.y * cos(rad)
+                    );
+                    gl_Position = proj.matrix * vec4(pos + size * 0.5 + offset, 0.0, 1.0);
+                    uv = mix(region.xy, region.zw, in_uv);
+                }
+                """,
+            fragment_shader="""
+                #version 330
+
+                uniform sampler2D atlas;
+                uniform float alpha;
+
+                in vec2 uv;
+                out vec4 fragColor;
+
+                void main() {
+                    fragColor = texture(atlas, uv);
+                    fragColor.a *= alpha;
+                }
+                """,
+        )
+
+    def draw(self, texture, x: float, y: float, width: float, height: float, angle=0, alpha: int = 255) -> bool:
+        """Draws the region of the texture into the current viewport, returns False if it is not part of the atlas"""
+        region = self.region(texture)
+        if region is None:
+            return False
+
+        if self._program is None:
+            self._setup()
+
+        self._textures[region.page].use(0)
+        program = self._program
+        program["pos"] = x, y
+        program["size"] = width, height
+        program["region"] = region.uv(self.pages[region.page].size)
+        program["angle"] = angle
+        program["alpha"] = alpha / 255
+        self._quad.render(program)
+        self.draw_calls += 1
+        return True
+
+
+class UIAtlasBuilder:
+    """
+    Collects textures and packs them into as few pages as possible.
+    Textures are identified by name, adding the same texture twice keeps one region.
+    """
+
+    def __init__(self, max_size: int = 2048, padding: int = 1):
+        self.max_size = max_size
+        self.padding = padding
+        self._images: Dict[str, Image.Image] = {}
+
+    def __len__(self):
+        return len(self._images)
+
+    def add(self, name: str, image: Image.Image):
+        if image.width + self.padding > self.max_size or image.height + self.padding > self.max_size:
+            raise ValueError(f"{name} ({image.width}x{image.height}) does not fit into an atlas page")
+        self._images.setdefault(name, image)
+
+    def add_texture(self, *textures: TextureLike):
+        for texture in map(resolve_texture, textures):
+            self.add(texture.name, texture.image)
+
+    def add_state_textures(self, *state_textures: UIStateTextures):
+        """Adds the normal texture and all state variants, missing variants are created"""
+        for item in state_textures:
+            item.warm_up()
+            self.add_texture(item.normal, *(item[state] for state in item.states))
+
+    def pack(self) -> Tuple[List[Tuple[int, int]], Dict[str, AtlasRegion], int]:
+        """
+        Computes regions without creating images.
+
+        :return: page sizes, regions and the covered area
+        """
+        # tall textures first give dense rows
+        order = sorted(self._images.items(), key=lambda item: (item[1].height, item[1].width), reverse=True)
+
+        # smallest single page holding all textures, otherwise multiple pages of max size
+        area = sum((image.width + self.padding) * (image.height + self.padding) for _, image in order)
+        for width, height in self._page_sizes(area):
+            packer = SkylinePacker(width, height, self.padding)
+            regions = self._pack_page(order, packer, 0)
+            if regions is not None:
+                return [(width, height)], regions, packer.used_area
+
+        packers: List[SkylinePacker] = []
+        regions: Dict[str, AtlasRegion] = {}
+        for name, image in order:
+            for page, packer in enumerate(packers):
+                position = packer.insert(image.width, image.height)
+                if position is not None:
+                    break
+            else:
+                packer = SkylinePacker(self.max_size, self.max_size, self.padding)
+                packers.append(packer)
+                page = len(packers) - 1
+                position = packer.insert(image.width, image.height)
+
+            regions[name] = AtlasRegion(page, position[0], position[1], image.width, image.height)
+
+        # the last page is cut to the smallest power of two covering its content
+        sizes = [(self.max_size, self.max_size)] * len(packers)
+        if packers:
+            last = len(packers) - 1
+            right = max(region.x + region.width for region in regions.values() if region.page == last)
+            sizes[last] = (
+                min(_power_of_two(right + self.padding), self.max_size),
+                min(_power_of_two(packers[last].used_height), self.max_size),
+            )
+
+        return sizes, regions, sum(packer.used_area for packer in packers)
+
+    def _page_sizes(self, area: int) -> List[Tuple[int, int]]:
+        """Power of two page sizes up to max size which could hold the area, smallest first"""
+        sizes = []
+        width = 1
+        while width <= self.max_size:
+            for height in (width // 2, width):
+                if height and width * height >= area:
+                    sizes.append((width, height))
+            width *= 2
+        return sorted(sizes, key=lambda size: (size[0] * size[1], size[0]))
+
+    @staticmethod
+    def _pack_page(order, packer: SkylinePacker, page: int) -> Optional[Dict[str, AtlasRegion]]:
+        regions = {}
+        for name, image in order:
+            position = packer.insert(image.width, image.height)
+            if position is None:
+                return None
+            regions[name] = AtlasRegion(page, position[0], position[1], image.width, image.height)
+        return regions
+
+    def build(self) -> UIAtlas:
+        sizes, regions, used_area = self.pack()
+
+        pages = [Image.new("RGBA", size, (0, 0, 0, 0)) for size in sizes]
+        for name, region in regions.items():
+            image = self._images[name]
+            if image.mode != "RGBA":
+                image = image.convert("RGBA")
+            pages[region.page].paste(image, (region.x, region.y))
+
+        return UIAtlas(pages, regions, used_area)
+
+
+def _power_of_two(value: int) -> int:
+    size = 1
+    while size < value:
+        size *= 2
+    return size
+
+
+def build_atlas(textures: Iterable[TextureLike] = (), state_textures: Iterable[UIStateTextures] = (),
+                max_size: int = 2048) -> UIAtlas:
+    """Atlas with the given textures and state textures including all variants"""
+    builder = UIAtlasBuilder(max_size=max_size)
+    builder.add_texture(*textures)
+    builder.add_state_textures(*state_textures)
+    return builder.build()
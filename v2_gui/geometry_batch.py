@@ -0,0 +1,184 @@
+from array import array
+from typing import List, Optional, Tuple
+
+import arcade
+from arcade.gl import BufferDescription
+from arcade.gui import Surface
+
+Rect = Tuple[float, float, float, float]
+
+
+def _rgba(color: arcade.Color) -> Tuple[int, int, int, int]:
+    if len(color) == 3:
+        return color[0], color[1], color[2], 255
+    return tuple(color)  # type: ignore
+
+
+class UIGeometry:
+    """
+    Colored triangles in surface coordinates, used to describe the background, border and plain content
+    of a widget. Vertex data is kept on the CPU, so geometry can be cached and combined cheaply.
+    """
+    __slots__ = ("positions", "colors")
+
+    def __init__(self):
+        self.positions = array("f")
+        self.colors = array("B")
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.positions) // 2
+
+    def add_rect(self, rect: Rect, color: arcade.Color):
+        """Filled rect as two triangles, empty rects are ignored"""
+        x, y, width, height = rect
+        if width <= 0 or height <= 0:
+            return
+
+        right = x + width
+        top = y + height
+        self.positions.extend((
+            x, y, right, y, right, top,
+            x, y, right, top, x, top,
+        ))
+        self.colors.extend(_rgba(color) * 6)
+
+    def add_outline(self, rect: Rect, border_width: float, color: arcade.Color):
+        """Border along the inner edges of the rect"""
+        x, y, width, height = rect
+        border_width = min(border_width, width / 2, height / 2)
+        if border_width <= 0:
+            return
+
+        self.add_rect((x, y, width, border_width), color)
+        self.add_rect((x, y + height - border_width, width, border_width), color)
+        self.add_rect((x, y + border_width, border_width, height - 2 * border_width), color)
+        self.add_rect((x + width - border_width, y + border_width, border_width, height - 2 * border_width), color)
+
+
+class UIGeometryBatch:
+    """
+    Collects :class:`UIGeometry` of a render pass and submits it with a single draw call.
+
+    The batch has to be flushed before anything else is drawn to keep the draw order.
+    Added geometry must not change afterwards. If a flush draws the same geometry as the previous flush,
+    the vertex buffers are not uploaded again.
+    """
+
+    def __init__(self, ctx=None):
+        self._ctx = ctx
+        self._program = None
+        self._geometry = None
+        self._position_buffer = None
+        self._color_buffer = None
+
+        self._pending: List[UIGeometry] = []
+        # geometry in the vertex buffers and its vertex counts
+        self._uploaded: List[Tuple[UIGeometry, int]] = []
+        self.submitted_vertices = 0
+        self.uploaded_vertices = 0
+
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices waiting for the next flush"""
+        return sum(geometry.vertex_count for geometry in self._pending)
+
+    def add(self, geometry: UIGeometry):
+        self._pending.append(geometry)
+
+    def clear(self):
+        self._pending = []
+
+    def _setup(self):
+        ctx = self._ctx = self._ctx or arcade.get_window().ctx
+        self._program = ctx.program(
+            vertex_shader="""
+                #version 330
+
+                uniform Projection {
+                    uniform mat4 matrix;
+                } proj;
+
+                in vec2 in_vert;
+                in vec4 in_color;
+
+                out vec4 color;
+
+                void main() {
+                    gl_Position = proj.matrix * vec4(in_vert, 0.0, 1.0);
+                    color = in_color;
+                }
+                """,
+            fragment_shader="""
+                #version 330
+
+                in vec4 color;
+                out vec4 fragColor;
+
+                void main() {
+                    fragColor = color;
+                }
+                """,
+        )
+        self._position_buffer = ctx.buffer(reserve=4096)
+        self._color_buffer = ctx.buffer(reserve=2048)
+        self._geometry = ctx.geometry(
+            [
+                BufferDescription(self._position_buffer, "2f", ["in_vert"]),
+                BufferDescription(self._color_buffer, "4f1", ["in_color"], normalized=["in_color"]),
+            ],
+            mode=ctx.TRIANGLES,
+        )
+
+    def flush(self, surface: Optional[Surface] = None) -> bool:
+        """
+        Draws all pending geometry with one draw call.
+        If a surface is given, the projection is reset to the full surface first.
+
+        :return: True if a draw call was issued
+        """
+        vertices = self.vertex_count
+        if not vertices:
+            self.clear()
+            return False
+
+        if self._program is None:
+            self._setup()
+
+        if surface is not None:
+            # surface coordinates, scissor box of the surface still applies
+            limit_all = getattr(surface, "limit_all", None)
+            if limit_all is not None:
+                limit_all()
+            else:
+                surface.limit(0, 0, *surface.size)
+
+        uploaded = [(geometry, geometry.vertex_count) for geometry in self._pending]
+        if uploaded != self._uploaded:
+            self._upload()
+            self._uploaded = uploaded
+            self.uploaded_vertices += vertices
+
+        self._geometry.render(self._program, vertices=vertices)
+
+        self.submitted_vertices += vertices
+        self.clear()
+        return True
+
+    def _upload(self):
+        if len(self._pending) == 1:
+            combined = self._pending[0]
+        else:
+            combined = UIGeometry()
+            for geometry in self._pending:
+                combined.positions.extend(geometry.positions)
+                combined.colors.extend(geometry.colors)
+
+        positions = combined.positions.tobytes()
+        colors = combined.colors.tobytes()
+        if self._position_buffer.size < len(positions):
+            self._position_buffer.orphan(size=len(positions) * 2)
+        if self._color_buffer.size < len(colors):
+            self._color_buffer.orphan(size=len(colors) * 2)
+        self._position_buffer.write(positions)
+        self._color_buffer.write(colors)
@@ -0,0 +1,196 @@
+from typing import List, Optional
+from weakref import ref, finalize
+
+import numpy as np
+from arcade.gui.widgets import _Rect
+
+# Rows of the geometry array, rect uses the first four rows
+FIELDS = (
+    "x",
+    "y",
+    "width",
+    "height",
+    "border_width",
+    "padding_top",
+    "padding_right",
+    "padding_bottom",
+    "padding_left",
+)
+_ROWS = {name: row for row, name in enumerate(FIELDS)}
+
+
+class UIGeometryStore:
+    """
+    Keeps rect, border width, padding and visibility of many :class:`v2_gui.widget.UIWidgetV2`
+    in contiguous numpy arrays (struct of arrays), indexed by the widgets store index.
+
+    Widgets using a store read and write these properties from the arrays,
+    the attribute API of the widget does not change.
+
+    .. code:: py
+
+        store = UIGeometryStore()
+        widgets = [UIWidgetV2(geometry_store=store) for _ in range(10_000)]
+
+        content_rects = store.content_rects()
+        visible = store.visibility()
+
+    Vectorized results contain one row per index, use :meth:`index_of` or :meth:`widget`
+    to map between widgets and rows. Rows of released widgets are not alive and not visible.
+    """
+
+    def __init__(self, capacity=1024):
+        capacity = max(1, capacity)
+        self._geometry = np.zeros((len(FIELDS), capacity), dtype=np.float64)
+        self._visible = np.zeros(capacity, dtype=bool)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._parent = np.full(capacity, -1, dtype=np.int64)
+        self._widgets: List[Optional[ref]] = [None] * capacity
+
+        self._free: List[int] = []
+        self._count = 0
+
+    def __len__(self):
+        """Number of widgets in the store"""
+        return self._count - len(self._free)
+
+    @property
+    def capacity(self):
+        return self._geometry.shape[1]
+
+    def _grow(self):
+        capacity = self.capacity
+        new_capacity = capacity * 2
+
+        geometry = np.zeros((len(FIELDS), new_capacity), dtype=np.float64)
+        geometry[:, :capacity] = self._geometry
+        self._geometry = geometry
+
+        self._visible = np.concatenate([self._visible, np.zeros(capacity, dtype=bool)])
+        self._alive = np.concatenate([self._alive, np.zeros(capacity, dtype=bool)])
+        self._parent = np.concatenate([self._parent, np.full(capacity, -1, dtype=np.int64)])
+        self._widgets.extend([None] * capacity)
+
+    def add(self, widget) -> int:
+        """
+        Reserves a row for the widget, the row is released when the widget is garbage collected.
+        Has to be called before the widget sets any stored property.
+        """
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._count == self.capacity:
+                self._grow()
+            index = self._count
+            self._count += 1
+
+        self._geometry[:, index] = 0
+        self._visible[index] = True
+        self._alive[index] = True
+        self._parent[index] = -1
+        self._widgets[index] = ref(widget)
+
+        widget._store = self
+        widget._store_index = index
+        finalize(widget, self._release, index)
+        return index
+
+    def _release(self, index: int):
+        self._alive[index] = False
+        self._visible[index] = False
+        self._parent[index] = -1
+        self._widgets[index] = None
+        self._free.append(index)
+
+    def widget(self, index: int):
+        """Widget stored at index or None"""
+        widget_ref = self._widgets[index]
+        return widget_ref() if widget_ref else None
+
+    def index_of(self, widget) -> int:
+        if getattr(widget, "_store", None) is not self:
+            raise ValueError(f"{widget} is not part of this store")
+        return widget._store_index
+
+    # Access used by the widget properties
+    def get(self, name: str, index: int):
+        if name == "rect":
+            return _Rect(*self._geometry[:4, index].tolist())
+        if name == "visible":
+            return bool(self._visible[index])
+        return self._geometry[_ROWS[name], index].item()
+
+    def set(self, name: str, index: int, value):
+        if name == "rect":
+            self._geometry[:4, index] = tuple(value)
+        elif name == "visible":
+            self._visible[index] = value
+        else:
+            self._geometry[_ROWS[name], index] = value
+
+    def set_parent(self, index: int, parent):
+        """Parents outside of this store are handled as root"""
+        if parent is not None and getattr(parent, "_store", None) is self:
+            self._parent[index] = parent._store_index
+        else:
+            self._parent[index] = -1
+
+    # Vectorized access
+    def field(self, name: str) -> np.ndarray:
+        """View on a single field of all rows"""
+        if name == "visible":
+            return self._visible[:self._count]
+        return self._geometry[_ROWS[name], :self._count]
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self._alive[:self._count]
+
+    @property
+    def parents(self) -> np.ndarray:
+        """Store index of the parent of each row, -1 for roots"""
+        return self._parent[:self._count]
+
+    def rects(self) -> np.ndarray:
+        """Rect of all rows as array with shape (n, 4): x, y, width, height"""
+        return self._geometry[:4, :self._count].T.copy()
+
+    def content_rects(self) -> np.ndarray:
+        """Content rect of all rows as array with shape (n, 4): x, y, width, height"""
+        x, y, width, height, border, top, right, bottom, left = self._geometry[:, :self._count]
+        return np.stack([
+            x + border + left,
+            y + border + bottom,
+            width - 2 * border - left - right,
+            height - 2 * border - top - bottom,
+        ], axis=1)
+
+    def visibility(self) -> np.ndarray:
+        """
+        Effective visibility of all rows, a widget is only visible if all parents are visible.
+        Uses pointer jumping, so the tree depth only adds logarithmic iterations.
+        """
+        visible = self._visible[:self._count] & self._alive[:self._count]
+        ancestor = self._parent[:self._count].copy()
+
+        has_ancestor = ancestor >= 0
+        while has_ancestor.any():
+            targets = ancestor[has_ancestor]
+            visible[has_ancestor] &= visible[targets]
+            ancestor[has_ancestor] = ancestor[targets]
+            has_ancestor = ancestor >= 0
+
+        return visible
+
+    def bounds(self) -> Optional[_Rect]:
+        """Rect containing all visible widgets, None if no widget is visible"""
+        visible = self.visibility()
+        if not visible.any():
+            return None
+
+        x, y, width, height = self._geometry[:4, :self._count][:, visible]
+        left = x.min()
+        bottom = y.min()
+        right = (x + width).max()
+        top = (y + height).max()
+        return _Rect(left.item(), bottom.item(), (right - left).item(), (top - bottom).item())
@@ -0,0 +1,64 @@
+from time import perf_counter
+from typing import Optional
+
+from arcade.gui import UIManager
+
+from v2_gui import profiler as _profiling
+from v2_gui.atlas import UIAtlas
+from v2_gui.surface import RenderStats, UISurfaceV2
+from v2_gui.texture_cache import DEFAULT_TEXTURE_CACHE_BUDGET
+
+
+class UIManagerV2(UIManager):
+    """
+    UIManager which renders into :class:`UISurfaceV2` and collects :class:`RenderStats` per frame.
+
+    After :meth:`draw` the stats of the last frame are available via :attr:`stats`.
+
+    The texture cache budget limits the memory (in bytes) of subtrees cached per layer.
+    Textures contained in :attr:`atlas` are drawn through the atlas on all layers.
+    """
+
+    def __init__(self, window=None, auto_enable=False, texture_cache_budget=DEFAULT_TEXTURE_CACHE_BUDGET):
+        super().__init__(window=window, auto_enable=auto_enable)
+        self.stats = RenderStats()
+        self.texture_cache_budget = texture_cache_budget
+        self._atlas: Optional[UIAtlas] = None
+
+    @property
+    def atlas(self) -> Optional[UIAtlas]:
+        return self._atlas
+
+    @atlas.setter
+    def atlas(self, atlas: Optional[UIAtlas]):
+        self._atlas = atlas
+        for surface in self._surfaces.values():
+            surface.atlas = atlas
+        self.trigger_render()
+
+    def _get_surface(self, layer: int):
+        if layer not in self._surfaces:
+            if len(self._surfaces) > 2:
+                raise Exception("Don't use too much layers!")
+
+            self._surfaces[layer] = UISurfaceV2(
+                size=self.window.get_size(),
+                pixel_ratio=self.window.get_pixel_ratio(),
+                stats=self.stats,
+                texture_cache_budget=self.texture_cache_budget,
+            )
+            self._surfaces[layer].atlas = self._atlas
+
+        return self._surfaces.get(layer)
+
+    def draw(self):
+        self.stats.reset()
+
+        profiler = _profiling._active
+        if profiler is None:
+            super().draw()
+            return
+
+        start = perf_counter()
+        super().draw()
+        profiler.frame(start, perf_counter())
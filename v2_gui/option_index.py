@@ -0,0 +1,233 @@
+"""
+Search index for the options of a dropdown, used for type-ahead and filtering.
+
+Search is case-insensitive. Prefix matches come from a sorted list of keys with bisect,
+substring matches from a trigram index whose candidates are verified.
+Queries shorter than a trigram or made of common trigrams scan the keys instead.
+The trigram index is built in steps with :meth:`UIOptionIndex.build`, until it is complete queries scan the keys.
+A query extending the previous one, like while typing, only narrows down the previous matches.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set
+
+# length of the n-grams used for substring search
+GRAM = 3
+# keys added to the trigram index by a query instead of scanning all keys
+_FLUSH_KEYS = 256
+# fewer added keys are inserted one by one instead of sorting all keys again
+_INSERT_KEYS = 32
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def _grams(key: str) -> Set[str]:
+    return {key[i:i + GRAM] for i in range(len(key) - GRAM + 1)}
+
+
+class _Matches:
+    """
+    Matches of a query as positions in the sorted keys,
+    a range of keys starting with the query and the sorted positions of keys containing it elsewhere
+    """
+
+    __slots__ = ("query", "start", "end", "containing")
+
+    def __init__(self, query: str, start: int, end: int, containing: List[int]):
+        self.query = query
+        self.start = start
+        self.end = end
+        self.containing = containing
+
+
+class UIOptionIndex:
+    """
+    Options indexed by their casefolded text, adding and removing options updates the index in place.
+
+    Results list prefix matches first, then other substring matches, each in alphabetical order.
+    """
+
+    def __init__(self, options: Iterable[str] = ()):
+        # sorted keys and the first option of each key
+        self._keys: List[str] = []
+        self._options: List[str] = []
+        self._first: Dict[str, str] = {}
+        # further options of a key, like duplicates
+        self._extra: Dict[str, List[str]] = {}
+        # trigram -> keys, pending keys are not part of it yet
+        self._grams: Dict[str, Set[str]] = defaultdict(set)
+        self._pending: List[str] = []
+        # matches of the last search, narrowed down while typing
+        self._last: Optional[_Matches] = None
+
+        self.update(options)
+
+    def __len__(self):
+        return len(self._keys) + sum(map(len, self._extra.values()))
+
+    def __contains__(self, option: str) -> bool:
+        key = option.casefold()
+        return self._first.get(key) == option or option in self._extra.get(key, ())
+
+    def update(self, options: Iterable[str]):
+        """Adds many options, faster than single adds"""
+        first = self._first
+        added = []
+        for option in options:
+            key = option.casefold()
+            if key in first:
+                self._extra.setdefault(key, []).append(option)
+            else:
+                first[key] = option
+                added.append(key)
+
+        if not added:
+            return
+
+        self._last = None
+        if len(added) < _INSERT_KEYS:
+            for key in added:
+                index = bisect_left(self._keys, key)
+                self._keys.insert(index, key)
+                self._options.insert(index, first[key])
+            self._pending.extend(added)
+        else:
+            keys = self._keys + added
+            options = self._options + [first[key] for key in added]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            # copies allocated in sorted order, so scans and results read memory in order (3-5x faster)
+            self._keys = [(keys[i] + " ")[:-1] for i in order]
+            self._options = [(options[i] + " ")[:-1] for i in order]
+            self._pending.extend(added)
+
+    def add(self, option: str):
+        self.update((option,))
+
+    def remove(self, option: str):
+        key = option.casefold()
+        extra = self._extra.get(key)
+        if extra:
+            self._last = None
+            if self._first[key] == option:
+                # the next option of the key takes its place
+                option = self._first[key] = extra.pop(0)
+                self._options[bisect_left(self._keys, key)] = option
+            else:
+                extra.remove(option)
+            if not extra:
+                del self._extra[key]
+            return
+
+        if self._first.get(key) != option:
+            raise ValueError(f"{option!r} is not in the index")
+
+        self._last = None
+        del self._first[key]
+        index = bisect_left(self._keys, key)
+        del self._keys[index]
+        del self._options[index]
+        # pending keys are skipped once they are removed
+        for gram in _grams(key):
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._grams[gram]
+
+    def clear(self):
+        self._last = None
+        self._keys.clear()
+        self._options.clear()
+        self._first.clear()
+        self._extra.clear()
+        self._grams.clear()
+        self._pending.clear()
+
+    @property
+    def built(self) -> bool:
+        """True if the trigram index contains all keys"""
+        return not self._pending
+
+    def build(self, max_keys: Optional[int] = None) -> bool:
+        """
+        Adds pending keys to the trigram index, at most ``max_keys`` to spread the work over frames.
+
+        :return: True if the trigram index is complete
+        """
+        pending = self._pending
+        count = len(pending) if max_keys is None else min(max_keys, len(pending))
+        grams, first = self._grams, self._first
+        for key in pending[len(pending) - count:]:
+            if key in first:
+                for gram in _grams(key):
+                    grams[gram].add(key)
+        del pending[len(pending) - count:]
+        return not pending
+
+    def _match(self, query: str) -> _Matches:
+        keys = self._keys
+        last = self._last
+        if last is not None and query.startswith(last.query):
+            # typing narrows the previous matches
+            start = bisect_left(keys, query, last.start, last.end)
+            end = bisect_left(keys, query + _MAX_CHAR, start, last.end)
+            containing = [i for i in last.containing if query in keys[i]]
+            others = [i for i in range(last.start, start) if query in keys[i]]
+            others += [i for i in range(end, last.end) if query in keys[i]]
+            if others:
+                containing = sorted(containing + others)
+        else:
+            start = bisect_left(keys, query)
+            end = bisect_left(keys, query + _MAX_CHAR, start)
+
+            candidates = None
+            if len(self._pending) <= _FLUSH_KEYS:
+                self.build()
+            if len(query) >= GRAM and not self._pending:
+                gram_sets = sorted((self._grams.get(gram, ()) for gram in _grams(query)), key=len)
+                # verifying all keys is faster than sorting most of them
+                if len(gram_sets[0]) * 8 < len(keys):
+                    candidates = set(gram_sets[0]).intersection(*gram_sets[1:])
+
+            if candidates is None:
+                containing = [i for i in range(start) if query in keys[i]]
+                containing += [i for i in range(end, len(keys)) if query in keys[i]]
+            else:
+                containing = sorted(bisect_left(keys, key) for key in candidates
+                                    if query in key and not key.startswith(query))
+
+        self._last = _Matches(query, start, end, containing)
+        return self._last
+
+    def first(self, prefix: str) -> Optional[str]:
+        """First option in alphabetical order starting with the prefix, for type-ahead"""
+        prefix = prefix.casefold()
+        index = bisect_left(self._keys, prefix)
+        if index < len(self._keys) and self._keys[index].startswith(prefix):
+            return self._options[index]
+        return None
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Options containing the query, starting with prefix matches"""
+        query = query.casefold()
+        options = self._options
+        if not query:
+            start, end, containing = 0, len(options), []
+        else:
+            matches = self._match(query)
+            start, end, containing = matches.start, matches.end, matches.containing
+
+        if not self._extra:
+            if limit is not None:
+                end = min(end, start + limit)
+                containing = containing[:limit - (end - start)]
+            return options[start:end] + list(map(options.__getitem__, containing))
+
+        keys, extra = self._keys, self._extra
+        results = []
+        for i in chain(range(start, end), containing):
+            results.append(options[i])
+            results.extend(extra.get(keys[i], ()))
+            if limit is not None and len(results) >= limit:
+                break
+        return results[:limit]
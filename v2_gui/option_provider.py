@@ -0,0 +1,263 @@
+"""
+Options which are fetched in pages on demand, for dropdowns with too many options to load up front.
+
+A provider is a callable ``provider(offset, limit, query)`` returning the options of a page,
+either as list or as :class:`OptionPage` with the total number of matching options,
+or an async iterator yielding lists of options.
+Providers run on a worker thread, the dropdown shows the pages once they arrived.
+
+.. code:: py
+
+    def saves(offset, limit, query):
+        rows = db.execute("SELECT name FROM saves WHERE name LIKE ? LIMIT ? OFFSET ?", (f"%{query}%", limit, offset))
+        return [name for name, in rows]
+
+    dropdown = UIDropdown(options=saves, visible_rows=10)
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGES = 16
+
+
+class OptionPage(NamedTuple):
+    options: List[str]
+    # number of options matching the query, None if unknown
+    total: Optional[int] = None
+
+
+OptionProvider = Callable[[int, int, str], Union[OptionPage, Sequence[str]]]
+
+
+class AsyncIteratorProvider:
+    """
+    Provider reading pages from an async iterator, which has no random access or search.
+    Pages are read in order until the requested options are available, searches filter the options read so far.
+    The iterator runs on its own event loop within the worker thread.
+    """
+
+    def __init__(self, iterator: AsyncIterator[Sequence[str]]):
+        self._iterator = iterator
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = Lock()
+        self._options: List[str] = []
+        self._exhausted = False
+
+    def _read(self) -> bool:
+        """Reads the next page, returns False if the iterator is exhausted"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        try:
+            page = self._loop.run_until_complete(self._iterator.__anext__())
+        except StopAsyncIteration:
+            self._exhausted = True
+            return False
+        self._options.extend(page)
+        return True
+
+    def __call__(self, offset: int, limit: int, query: str) -> OptionPage:
+        with self._lock:
+            query = query.casefold()
+            matches = self._options
+            while True:
+                if query:
+                    matches = [option for option in self._options if query in option.casefold()]
+                if len(matches) >= offset + limit or self._exhausted or not self._read():
+                    break
+
+            total = len(matches) if self._exhausted else None
+            return OptionPage(matches[offset:offset + limit], total)
+
+    def close(self):
+        with self._lock:
+            if self._loop is not None:
+                aclose = getattr(self._iterator, "aclose", None)
+                if aclose is not None:
+                    self._loop.run_until_complete(aclose())
+                self._loop.close()
+                self._loop = None
+
+
+class UIPagedOptions:
+    """
+    Options of a provider for the current :attr:`query`, read like a list.
+
+    Reading options which are not loaded yet requests their pages and returns None for them.
+    :meth:`poll` stores fetched pages on the main thread, it raises errors of the provider.
+    At most ``max_pages`` pages are kept, the least recently used are evicted and fetched again if required,
+    so it should exceed the pages shown at once.
+    While the total is unknown, the length includes one row after the loaded options, reading it fetches the next page.
+    """
+
+    def __init__(self,
+                 provider: Union[OptionProvider, AsyncIterator[Sequence[str]]],
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 max_pages: int = DEFAULT_MAX_PAGES):
+        if hasattr(provider, "__anext__"):
+            provider = AsyncIteratorProvider(provider)
+        self.provider = provider
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.query = ""
+
+        # (query, page number) -> options
+        self._pages: "OrderedDict[Tuple[str, int], List[str]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, int], Future] = {}
+        # query -> number of matching options, if known
+        self._totals: Dict[str, int] = {}
+        # query -> number of options up to the end of the furthest loaded page
+        self._loaded_end: Dict[str, int] = {}
+        # pages are fetched one after another, like a database connection would require
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def total(self) -> Optional[int]:
+        """Number of options matching the query, None while unknown"""
+        return self._totals.get(self.query)
+
+    @property
+    def loading(self) -> bool:
+        return bool(self._pending)
+
+    def __len__(self):
+        total = self.total
+        if total is not None:
+            return total
+        return self._loaded_end.get(self.query, 0) + 1
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._get(index) for index in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        return self._get(item)
+
+    def _get(self, index: int) -> Optional[str]:
+        key = (self.query, index // self.page_size)
+        page = self._pages.get(key)
+        if page is None:
+            self.misses += 1
+            self._request(key)
+            return None
+
+        self.hits += 1
+        self._pages.move_to_end(key)
+        position = index % self.page_size
+        return page[position] if position < len(page) else None
+
+    def index(self, option: str) -> int:
+        """Position of a loaded option, raises ValueError if no loaded page contains it"""
+        for (query, number), page in self._pages.items():
+            if query == self.query and option in page:
+                return number * self.page_size + page.index(option)
+        raise ValueError(f"{option!r} is not loaded")
+
+    def request(self, start: int, end: int):
+        """Fetches the pages of the options from start to end, if they are not loaded yet"""
+        for number in range(start // self.page_size, (max(start, end - 1)) // self.page_size + 1):
+            key = (self.query, number)
+            if key not in self._pages:
+                self._request(key)
+
+    def _request(self, key: Tuple[str, int]):
+        if key in self._pending:
+            return
+        query, number = key
+        total = self._totals.get(query)
+        if total is not None and number * self.page_size >= total:
+            return
+
+        # pages of previous queries are not required anymore, unless they are already fetched
+        for other, future in list(self._pending.items()):
+            if other[0] != query and future.cancel():
+                del self._pending[other]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="option-provider")
+        self._pending[key] = self._executor.submit(self.provider, number * self.page_size, self.page_size, query)
+
+    def poll(self) -> bool:
+        """Stores fetched pages, returns True if options of the current query changed"""
+        changed = False
+        for key, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+
+            result = future.result()
+            page = result if isinstance(result, OptionPage) else OptionPage(list(result))
+            self._store(key, page)
+            changed |= key[0] == self.query
+        return changed
+
+    def _store(self, key: Tuple[str, int], page: OptionPage):
+        query, number = key
+        offset = number * self.page_size
+        if page.total is not None:
+            self._totals[query] = page.total
+        elif len(page.options) < self.page_size:
+            # a short page is the last one
+            self._totals[query] = offset + len(page.options)
+        self._loaded_end[query] = max(self._loaded_end.get(query, 0), offset + len(page.options))
+
+        self._pages[key] = list(page.options)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+            self.evictions += 1
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits for pending pages, which are stored by the next :meth:`poll`. Returns False on timeout."""
+        _, pending = wait(list(self._pending.values()), timeout=timeout)
+        return not pending
+
+    def clear(self):
+        """Drops loaded pages and totals, for providers whose options changed"""
+        self._pages.clear()
+        self._totals.clear()
+        self._loaded_end.clear()
+
+    def shutdown(self):
+        """Stops the worker thread after pending pages are fetched and closes the provider"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        close = getattr(self.provider, "close", None)
+        if close is not None:
+            close()
+
+
+class FakeOptionProvider:
+    """
+    Provider serving a list of options with a delay, standing in for a database in tests and examples.
+    Counts calls, :meth:`pages` provides the options as async iterator instead.
+    """
+
+    def __init__(self, options: Sequence[str], delay: float = 0.0):
+        self.options = list(options)
+        self.delay = delay
+        self.calls: List[Tuple[int, int, str]] = []
+
+    def __call__(self, offset: int, limit: int, query: str) -> OptionPage:
+        self.calls.append((offset, limit, query))
+        if self.delay:
+            time.sleep(self.delay)
+
+        query = query.casefold()
+        matches = [option for option in self.options if query in option.casefold()] if query else self.options
+        return OptionPage(matches[offset:offset + limit], len(matches))
+
+    async def pages(self, page_size: int = DEFAULT_PAGE_SIZE):
+        for offset in range(0, len(self.options), page_size):
+            self.calls.append((offset, page_size, ""))
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield self.options[offset:offset + page_size]
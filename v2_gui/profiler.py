@@ -0,0 +1,191 @@
+"""
+Render instrumentation for :class:`v2_gui.widget.UIWidgetV2` trees.
+
+.. code:: py
+
+    with UIRenderProfiler() as profiler:
+        manager.draw()
+
+    print(profiler.summary(10))
+    profiler.export_chrome_trace("frame.json")  # open with chrome://tracing or ui.perfetto.dev
+
+While no profiler is active, widgets only check a module attribute.
+"""
+import json
+from collections import Counter
+from time import perf_counter
+from typing import Dict, List, Optional
+
+# profiler which receives the hooks of widgets, only one can be active
+_active: Optional["UIRenderProfiler"] = None
+
+
+class WidgetProfile:
+    """Collected numbers of a single widget"""
+    __slots__ = ("name", "render_count", "base_time", "render_time", "triggers")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.render_count = 0
+        # seconds spent in do_render_base (or building batched geometry) and do_render
+        self.base_time = 0.0
+        self.render_time = 0.0
+        # property names which caused a trigger_full_render, "" for direct calls
+        self.triggers: Counter = Counter()
+
+    @property
+    def total_time(self):
+        return self.base_time + self.render_time
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "render_count": self.render_count,
+            "base_time": self.base_time,
+            "render_time": self.render_time,
+            "triggers": dict(self.triggers),
+        }
+
+
+class UIRenderProfiler:
+    """
+    Records per widget how often and how long it rendered and which property changes triggered renders.
+
+    Trace events are only kept up to ``max_events``, the per widget numbers are always complete.
+    """
+
+    def __init__(self, max_events=1_000_000):
+        self.max_events = max_events
+        self.profiles: Dict[int, WidgetProfile] = {}
+        self.events: List[dict] = []
+        self.dropped_events = 0
+
+        # property names changed per widget, until they trigger a render or are covered by pending damage
+        self._pending: Dict[int, List[str]] = {}
+        self._origin = perf_counter()
+
+    # Activation
+    def start(self):
+        global _active
+        if _active is not None and _active is not self:
+            raise RuntimeError("Another UIRenderProfiler is already active")
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        if _active is self:
+            _active = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def clear(self):
+        self.profiles.clear()
+        self.events.clear()
+        self._pending.clear()
+        self.dropped_events = 0
+
+    # Hooks, called by widgets
+    def _profile(self, widget) -> WidgetProfile:
+        key = id(widget)
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.profiles[key] = WidgetProfile(f"{type(widget).__name__}#{key:x}")
+        return profile
+
+    def _add_event(self, event: dict):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped_events += 1
+
+    def _us(self, timestamp: float) -> float:
+        return (timestamp - self._origin) * 1e6
+
+    def property_changed(self, widget, name: str):
+        self._pending.setdefault(id(widget), []).append(name)
+
+    def notification_suppressed(self, widget):
+        self._pending.pop(id(widget), None)
+
+    def full_render_triggered(self, widget):
+        properties = self._pending.pop(id(widget), None) or [""]
+        profile = self._profile(widget)
+        profile.triggers.update(properties)
+        self._add_event({
+            "name": "trigger_full_render",
+            "cat": "trigger",
+            "ph": "i",
+            "s": "t",
+            "ts": self._us(perf_counter()),
+            "pid": 0,
+            "tid": 0,
+            "args": {"widget": profile.name, "properties": [name for name in properties if name]},
+        })
+
+    def rendered(self, widget, start: float, base_end: float, end: float):
+        """Widget rendered, base covers do_render_base and the rest do_render"""
+        profile = self._profile(widget)
+        profile.render_count += 1
+        profile.base_time += base_end - start
+        profile.render_time += end - base_end
+
+        ts = self._us(start)
+        base_ts = self._us(base_end)
+        self._add_event({"name": profile.name, "cat": "render", "ph": "X", "ts": ts, "dur": self._us(end) - ts,
+                         "pid": 0, "tid": 0})
+        if base_end > start:
+            self._add_event({"name": "do_render_base", "cat": "render", "ph": "X", "ts": ts, "dur": base_ts - ts,
+                             "pid": 0, "tid": 0, "args": {"widget": profile.name}})
+        if end > base_end:
+            self._add_event({"name": "do_render", "cat": "render", "ph": "X", "ts": base_ts,
+                             "dur": self._us(end) - base_ts, "pid": 0, "tid": 0, "args": {"widget": profile.name}})
+
+    def frame(self, start: float, end: float):
+        """Frame drawn by the UIManagerV2"""
+        ts = self._us(start)
+        self._add_event({"name": "frame", "cat": "frame", "ph": "X", "ts": ts, "dur": self._us(end) - ts,
+                         "pid": 0, "tid": 0})
+
+    # Export
+    def to_json(self) -> dict:
+        return {
+            "widgets": [profile.to_dict() for profile in self.top()],
+            "dropped_events": self.dropped_events,
+        }
+
+    def export_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_json(), file, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Trace Event Format, timestamps in microseconds since the profiler was created"""
+        with open(path, "w") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+
+    def top(self, n: Optional[int] = None, key="total_time") -> List[WidgetProfile]:
+        """Profiles sorted by total_time, base_time, render_time or render_count"""
+        profiles = sorted(self.profiles.values(), key=lambda profile: getattr(profile, key), reverse=True)
+        return profiles if n is None else profiles[:n]
+
+    def summary(self, n=10) -> str:
+        """Table of the n widgets with the highest render time and the properties triggering most renders"""
+        lines = [f"{'widget':<40} {'renders':>8} {'base ms':>9} {'render ms':>10}  triggered by"]
+        for profile in self.top(n):
+            triggers = ", ".join(f"{name or '<direct>'}: {count}" for name, count in profile.triggers.most_common(3))
+            lines.append(f"{profile.name:<40} {profile.render_count:>8} {profile.base_time * 1e3:>9.3f} "
+                         f"{profile.render_time * 1e3:>10.3f}  {triggers}")
+
+        properties = Counter()
+        for profile in self.profiles.values():
+            properties.update(profile.triggers)
+        if properties:
+            lines.append("")
+            lines.append("renders triggered by: " + ", ".join(
+                f"{name or '<direct>'}: {count}" for name, count in properties.most_common(n)))
+
+        return "\n".join(lines)
@@ -0,0 +1,250 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Iterable
+
+from arcade.gui import UIWidget
+from arcade.gui.events import UIMouseMovementEvent, UIMousePressEvent, UIMouseDragEvent, UIMouseReleaseEvent, \
+    UIMouseScrollEvent, UIMouseEvent
+from arcade.gui.widgets import _Rect
+
+# Mouse events which are routed using the index, UIOnClickEvent is dispatched by the widgets themselves
+ROUTED_EVENTS = (
+    UIMouseMovementEvent,
+    UIMousePressEvent,
+    UIMouseDragEvent,
+    UIMouseReleaseEvent,
+    UIMouseScrollEvent,
+)
+
+
+class UISpatialIndex:
+    """
+    Uniform grid of widget rects within the subtree of a :class:`v2_gui.widget.UIWidgetV2`.
+
+    Used to route mouse events only along the paths to widgets under the cursor,
+    instead of passing them through the whole widget tree.
+    Besides widgets under the cursor, events are also routed to the widgets hit by the previous movement
+    (to leave hover state) and the widgets hit by the last press (release, drag and deactivation).
+
+    The index is maintained by the widgets:
+
+    - rect changes of a UIWidgetV2 re-index the widget and its non UIWidgetV2 descendants
+    - visibility and structure changes rebuild the index before the next query
+
+    Hidden subtrees are not indexed, routing still passes through the widget tree,
+    so the visibility checks of the widgets keep working.
+    """
+
+    def __init__(self, root, cell_size: int = 64):
+        self.root = root
+        self.cell_size = cell_size
+
+        self._cells: Dict[Tuple[int, int], Set[UIWidget]] = defaultdict(set)
+        self._entries: Dict[UIWidget, Tuple[_Rect, Tuple[int, int, int, int]]] = {}
+        # UIWidgetV2 -> widgets indexed together with it (itself and non UIWidgetV2 descendants)
+        self._groups: Dict[UIWidget, List[UIWidget]] = {}
+        self._stale: Set[UIWidget] = set()
+        self._valid = False
+
+        self._last_hits: Set[UIWidget] = set()
+        self._press_hits: Set[UIWidget] = set()
+
+    def __len__(self):
+        self._update()
+        return len(self._entries)
+
+    def invalidate(self):
+        """Rebuild the whole index before the next query"""
+        self._valid = False
+
+    def mark_stale(self, widget):
+        """Re-index the group of a UIWidgetV2 before the next query"""
+        if self._valid:
+            self._stale.add(widget)
+
+    def detach(self):
+        """Removes all references from widgets to this index"""
+        self._clear()
+        self._last_hits.clear()
+        self._press_hits.clear()
+        self._valid = False
+
+    def _clear(self):
+        for widget in self._groups:
+            widget._spatial_index = None
+        self._groups.clear()
+        self._entries.clear()
+        self._cells.clear()
+        self._stale.clear()
+
+    # Index maintenance
+    def _cell_range(self, rect: _Rect) -> Tuple[int, int, int, int]:
+        cell_size = self.cell_size
+        x, y, width, height = rect
+        return (
+            int(x // cell_size),
+            int(y // cell_size),
+            int((x + width) // cell_size),
+            int((y + height) // cell_size),
+        )
+
+    def _insert(self, widget: UIWidget):
+        rect = widget.rect
+        cell_range = self._cell_range(rect)
+        left, bottom, right, top = cell_range
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(bottom, top + 1):
+                cells[(cx, cy)].add(widget)
+        self._entries[widget] = rect, cell_range
+
+    def _remove(self, widget: UIWidget):
+        entry = self._entries.pop(widget, None)
+        if entry is None:
+            return
+
+        left, bottom, right, top = entry[1]
+        cells = self._cells
+        for cx in range(left, right + 1):
+            for cy in range(bottom, top + 1):
+                cell = cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(widget)
+                    if not cell:
+                        del cells[(cx, cy)]
+
+    def _move(self, widget: UIWidget):
+        entry = self._entries.get(widget)
+        if entry is not None and entry[0] == widget.rect:
+            return
+        self._remove(widget)
+        self._insert(widget)
+
+    def _collect_group(self, widget) -> List[UIWidget]:
+        """widget and all non UIWidgetV2 descendants, UIWidgetV2 descendants build their own groups"""
+        group = [widget]
+        stack = list(widget.children)
+        while stack:
+            child = stack.pop()
+            # only UIWidgetV2 provide _spatial_index
+            if hasattr(child, "_spatial_index"):
+                continue
+            group.append(child)
+            stack.extend(child.children)
+        return group
+
+    def _index_subtree(self, widget):
+        stack = [widget]
+        while stack:
+            current = stack.pop()
+            current._spatial_index = self
+
+            group = self._collect_group(current) if current.visible else []
+            self._groups[current] = group
+            for member in group:
+                self._insert(member)
+
+            # hidden subtrees are skipped, a visibility change rebuilds the index
+            if current.visible:
+                stack.extend(self._v2_children(group))
+
+    @staticmethod
+    def _v2_children(group: Iterable[UIWidget]) -> List[UIWidget]:
+        return [
+            child
+            for member in group
+            for child in member.children
+            if hasattr(child, "_spatial_index")
+        ]
+
+    def _refresh_group(self, widget):
+        old_group = self._groups.get(widget)
+        if old_group is None:
+            # not part of the index anymore
+            return
+
+        group = self._collect_group(widget) if widget.visible else []
+
+        # UIWidgetV2 added to a child which is no UIWidgetV2
+        if any(child not in self._groups for child in self._v2_children(group)):
+            self._valid = False
+            return
+
+        new_members = set(group)
+        for member in old_group:
+            if member not in new_members:
+                self._remove(member)
+        for member in group:
+            self._move(member)
+        self._groups[widget] = group
+
+    def _rebuild(self):
+        self._clear()
+        self._index_subtree(self.root)
+        self._valid = True
+
+    def _update(self):
+        if self._valid and self._stale:
+            for widget in self._stale:
+                self._refresh_group(widget)
+        self._stale.clear()
+
+        if not self._valid:
+            self._rebuild()
+
+    # Queries
+    def query(self, x: float, y: float) -> List[UIWidget]:
+        """Widgets which rect contains the point, the order is undefined"""
+        self._update()
+
+        cell_size = self.cell_size
+        cell = self._cells.get((int(x // cell_size), int(y // cell_size)))
+        if not cell:
+            return []
+
+        entries = self._entries
+        hits = []
+        for widget in cell:
+            left, bottom, width, height = entries[widget][0]
+            if left <= x <= left + width and bottom <= y <= bottom + height:
+                hits.append(widget)
+        return hits
+
+    def routes(self, event: UIMouseEvent) -> Dict[UIWidget, List[UIWidget]]:
+        """
+        Maps each widget on a path from the root to a target to the children the event should be passed to.
+        Children keep the order of :attr:`UIWidget.children`.
+        """
+        hits = set(self.query(event.x, event.y))
+        targets = hits | self._last_hits | self._press_hits
+
+        # only movement changes the hovered widgets, a scroll or press elsewhere must not end a hover
+        if isinstance(event, (UIMouseMovementEvent, UIMouseDragEvent)):
+            self._last_hits = hits
+        if isinstance(event, UIMousePressEvent):
+            self._press_hits = hits
+
+        root = self.root
+        routes: Dict[UIWidget, List[UIWidget]] = {}
+        for target in targets:
+            widget = target
+            routes.setdefault(widget, [])
+            while widget is not root:
+                parent = widget.parent
+                if not isinstance(parent, UIWidget):
+                    # not attached to the root anymore
+                    break
+
+                children = routes.get(parent)
+                if children is not None:
+                    if widget not in children:
+                        children.append(widget)
+                    break
+
+                routes[parent] = [widget]
+                widget = parent
+
+        for parent, children in routes.items():
+            if len(children) > 1:
+                children.sort(key=parent.children.index)
+
+        return routes
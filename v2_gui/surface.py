@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from arcade import Texture
+from arcade.gui import Surface
+
+from v2_gui.atlas import UIAtlas
+from v2_gui.geometry_batch import UIGeometryBatch
+from v2_gui.texture_cache import UITextureCache, DEFAULT_TEXTURE_CACHE_BUDGET
+
+
+class RenderStats:
+    """
+    Counters collected while rendering a single frame.
+
+    Reset by :class:`v2_gui.manager.UIManagerV2` before each frame.
+    """
+
+    def __init__(self):
+        self.redrawn_widgets = 0
+        self.suppressed_notifications = 0
+        # batch submissions plus widgets drawn immediately (counted as one draw call each)
+        self.draw_calls = 0
+        # widgets skipped, because they are outside of the surface or the content rect of a parent
+        self.culled_widgets = 0
+        # subtrees drawn from the texture cache
+        self.cached_subtrees = 0
+
+    def reset(self):
+        self.redrawn_widgets = 0
+        self.suppressed_notifications = 0
+        self.draw_calls = 0
+        self.culled_widgets = 0
+        self.cached_subtrees = 0
+
+    def __repr__(self):
+        return (f"RenderStats(redrawn_widgets={self.redrawn_widgets}, "
+                f"suppressed_notifications={self.suppressed_notifications}, "
+                f"draw_calls={self.draw_calls}, "
+                f"culled_widgets={self.culled_widgets}, "
+                f"cached_subtrees={self.cached_subtrees})")
+
+
+class UISurfaceV2(Surface):
+    """
+    Surface which collects :class:`RenderStats` and supports clipping draws to a region.
+
+    Provides a :class:`UIGeometryBatch`, which UIWidgetV2 use to draw backgrounds and borders
+    of a render pass with a single draw call.
+
+    Subtrees using ``cache_as_texture`` are kept in the :class:`UITextureCache` of the surface,
+    a budget of 0 disables caching.
+    Offscreen surfaces of the cache use an origin, so widgets draw with their usual coordinates.
+
+    Textures contained in the :attr:`atlas` are drawn through their atlas region.
+    """
+
+    def __init__(self, *,
+                 stats: Optional[RenderStats] = None,
+                 texture_cache_budget: int = DEFAULT_TEXTURE_CACHE_BUDGET,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats or RenderStats()
+        self.batch = UIGeometryBatch(self.ctx)
+        self.texture_cache = UITextureCache(texture_cache_budget) if texture_cache_budget else None
+        # surface coordinates of the lower left corner
+        self.origin = (0, 0)
+        self.atlas: Optional[UIAtlas] = None
+
+    def limit(self, x, y, width, height):
+        ox, oy = self.origin
+        super().limit(x - ox, y - oy, width, height)
+
+    def limit_all(self):
+        """Draw area of the whole buffer, drawing in surface coordinates which start at the origin"""
+        ox, oy = self.origin
+        width, height = self.size
+        self.fbo.viewport = (0, 0, *self.size_scaled)
+        self.ctx.projection_2d = ox, ox + max(width, 1), oy, oy + max(height, 1)
+
+    @contextmanager
+    def activate(self):
+        """Like :meth:`Surface.activate`, but the origin is applied once by the projection instead of the viewport"""
+        projection = self.ctx.projection_2d
+        self.limit_all()
+
+        with self.fbo.activate():
+            yield self
+
+        self.ctx.projection_2d = projection
+
+    def draw_texture(self, x: float, y: float, width: float, height: float, tex: Texture, angle=0, alpha: int = 255):
+        if self.atlas is None or not self.atlas.draw(tex, x, y, width, height, angle=angle, alpha=alpha):
+            super().draw_texture(x, y, width, height, tex, angle=angle, alpha=alpha)
+
+    def create_offscreen(self, size) -> "UISurfaceV2":
+        """Surface to render a subtree into, shares the stats, pixel ratio and atlas of this surface"""
+        offscreen = UISurfaceV2(size=size, pixel_ratio=self.pixel_ratio, stats=self.stats, texture_cache_budget=0)
+        offscreen.atlas = self.atlas
+        return offscreen
+
+    @contextmanager
+    def clip(self, x, y, width, height):
+        """Draw calls within the context only affect the given region, including :meth:`clear`"""
+        with clip(self, (x, y, width, height)):
+            yield self
+
+
+@contextmanager
+def clip(surface: Surface, rect: Tuple[float, float, float, float]):
+    """
+    Limits all draw calls and clears on a surface to the given rect by using a scissor box.
+
+    Works with every :class:`arcade.gui.Surface`, the previous scissor box is restored afterwards.
+    """
+    fbo = surface.fbo
+    ratio = surface.pixel_ratio
+    x, y, width, height = rect
+    ox, oy = getattr(surface, "origin", (0, 0))
+    x -= ox
+    y -= oy
+
+    previous = fbo.scissor
+    fbo.scissor = (
+        int(x * ratio),
+        int(y * ratio),
+        int(width * ratio),
+        int(height * ratio),
+    )
+    try:
+        yield surface
+    finally:
+        fbo.scissor = previous
+        # viewport setter re-applies the scissor box, if no scissor is set
+        fbo.viewport = fbo.viewport
@@ -0,0 +1,124 @@
+"""
+Retained text objects for widget labels.
+
+:func:`arcade.draw_text` keeps one pyglet label per font setting and replaces its text and position on every call,
+so widgets with different labels rebuild the text layout on every render.
+Widgets keep a :class:`UILabelText` instead, which is rebuilt only when the text or its style changes.
+Identical labels share one :class:`arcade.Text` through :data:`text_cache`.
+"""
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import arcade
+from arcade import Color
+
+DEFAULT_TEXT_CACHE_SIZE = 512
+
+
+class TextKey(NamedTuple):
+    text: str
+    x: float
+    y: float
+    color: Color
+    font_size: float
+    width: int
+    align: str
+    anchor_x: str
+    anchor_y: str
+    font_name: tuple
+    bold: bool
+    italic: bool
+
+
+class UITextCache:
+    """
+    Text objects shared between widgets, keyed by text, position and style.
+
+    Holds at most ``max_entries`` objects, the least recently used are evicted.
+    Widgets keep their text object after eviction, only sharing with new widgets ends.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[TextKey, arcade.Text]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: TextKey) -> arcade.Text:
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+        self.misses += 1
+        text = arcade.Text(
+            text=key.text,
+            start_x=key.x,
+            start_y=key.y,
+            color=key.color,
+            font_size=key.font_size,
+            width=key.width,
+            align=key.align,
+            anchor_x=key.anchor_x,
+            anchor_y=key.anchor_y,
+            font_name=key.font_name,
+            bold=key.bold,
+            italic=key.italic,
+        )
+
+        self._entries[key] = text
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return text
+
+    def clear(self):
+        self._entries.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# process-wide cache, shared by all widgets
+text_cache = UITextCache()
+
+
+class UILabelText:
+    """Text object of a widget, looked up again only if one of the inputs changes"""
+
+    __slots__ = ("cache", "key", "text")
+
+    def __init__(self, cache: UITextCache = None):
+        self.cache = cache or text_cache
+        self.key: Optional[TextKey] = None
+        self.text: Optional[arcade.Text] = None
+
+    def draw(self,
+             text: str,
+             x: float,
+             y: float,
+             color: Color = arcade.color.WHITE,
+             font_size: float = 12,
+             width: int = 0,
+             align: str = "left",
+             anchor_x: str = "left",
+             anchor_y: str = "baseline",
+             font_name=("calibri", "arial"),
+             bold: bool = False,
+             italic: bool = False):
+        """Draws the text like :func:`arcade.draw_text`"""
+        key = TextKey(str(text), x, y, tuple(color), font_size, int(width), align, anchor_x, anchor_y,
+                      tuple(font_name) if isinstance(font_name, (list, tuple)) else font_name, bold, italic)
+        if key != self.key:
+            self.text = self.cache.get(key)
+            self.key = key
+
+        self.text.draw()
@@ -0,0 +1,89 @@
+import weakref
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from arcade.gui import Surface
+
+# 64 MiB, a 512x512 subtree uses 1 MiB at pixel ratio 1
+DEFAULT_TEXTURE_CACHE_BUDGET = 64 * 1024 * 1024
+
+
+class UITextureCache:
+    """
+    Offscreen surfaces of subtrees rendered with ``cache_as_texture``, see :class:`v2_gui.widget.UIWidgetV2`.
+
+    The memory of all surfaces is limited by the budget in bytes,
+    if a new surface does not fit, the least recently used surfaces are released.
+    Widgets are referenced weakly, surfaces of widgets which are gone are released with them.
+    """
+
+    def __init__(self, budget: int = DEFAULT_TEXTURE_CACHE_BUDGET):
+        self.budget = budget
+        self.used_bytes = 0
+        self.evictions = 0
+        # weak reference to the widget -> surface, bytes
+        self._entries: "OrderedDict[weakref.ref, Tuple[Surface, int]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, widget):
+        return weakref.ref(widget) in self._entries
+
+    def _release(self, key: weakref.ref):
+        """Called when a widget is garbage collected"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.used_bytes -= entry[1]
+
+    @staticmethod
+    def _bytes(surface: Surface) -> int:
+        width, height = surface.size_scaled
+        return width * height * 4
+
+    def get(self, widget) -> Optional[Surface]:
+        """Surface of the widget, marks it as recently used"""
+        key = weakref.ref(widget)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def acquire(self, widget, size: Tuple[float, float], create: Callable[[Tuple[float, float]], Surface]) \
+            -> Optional[Surface]:
+        """
+        Surface with the given size for the widget, existing surfaces are resized.
+        Returns None if the size exceeds the whole budget.
+        """
+        surface = self.discard(widget)
+
+        if surface is None:
+            surface = create(size)
+        else:
+            surface.resize(size=size, pixel_ratio=surface.pixel_ratio)
+
+        required = self._bytes(surface)
+        if required > self.budget:
+            return None
+
+        while self._entries and self.used_bytes + required > self.budget:
+            _, (_, released) = self._entries.popitem(last=False)
+            self.used_bytes -= released
+            self.evictions += 1
+
+        self._entries[weakref.ref(widget, self._release)] = surface, required
+        self.used_bytes += required
+        return surface
+
+    def discard(self, widget) -> Optional[Surface]:
+        """Releases the surface of the widget and returns it"""
+        entry = self._entries.pop(weakref.ref(widget), None)
+        if entry is None:
+            return None
+        self.used_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.used_bytes = 0
@@ -0,0 +1,423 @@
+"""
+Textures derived from widget skins, like the brighter hover and darker pressed variants of a button.
+
+Variants are cached process-wide by the content of the source image and the transform,
+so widgets sharing a skin compute and store each variant once.
+Transforms are numpy array math on the pixels, :func:`state_textures` creates the variants
+of many textures in one pass over all pixels.
+
+.. code:: py
+
+    hover_tex = brightness(texture, 1.5)
+    pressed_tex = brightness(texture, 0.5)
+
+    # hover, pressed and disabled variants of all skins at once
+    states = state_textures([button_tex, toggle_on_tex, toggle_off_tex])
+    states[0]["disabled"]
+
+Widgets keep their skin in :class:`UIStateTextures`, which creates variants on first use.
+:func:`warm_up_async` creates the missing variants of many widgets in a background thread,
+e.g. after the first frame was drawn.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import blake2b
+from threading import RLock
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from weakref import ref
+
+import arcade
+import numpy as np
+from PIL import Image
+
+from v2_gui.assets import TextureHandle, TextureLike
+
+# 32 MiB, about 2000 button variants of 64x64 pixels
+DEFAULT_DERIVED_TEXTURE_BUDGET = 32 * 1024 * 1024
+
+
+def _image_bytes(image: Image.Image) -> int:
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+def _transform_key(transform: Hashable) -> Hashable:
+    """
+    Key including the types of transforms, NamedTuples with equal fields are equal, like Alpha(0.5) and Brightness(0.5)
+    """
+    if isinstance(transform, tuple):
+        return type(transform), tuple(map(_transform_key, transform))
+    return transform
+
+
+class UIDerivedTextureCache:
+    """
+    LRU cache of textures derived from a source image.
+
+    Keys are a digest of the source image content and a hashable transform description.
+    The memory of cached images is limited by the budget in bytes.
+    The cache can be used from multiple threads.
+    """
+
+    def __init__(self, budget: int = DEFAULT_DERIVED_TEXTURE_BUDGET):
+        self.budget = budget
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[arcade.Texture, int]]" = OrderedDict()
+        # digest per source image, PIL images are not hashable
+        self._digests: Dict[int, Tuple[ref, str]] = {}
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def digest(self, image: Image.Image) -> str:
+        """Digest of mode, size and pixels, computed once per image object"""
+        with self._lock:
+            return self._digest(image)
+
+    def _digest(self, image: Image.Image) -> str:
+        key = id(image)
+        entry = self._digests.get(key)
+        if entry is not None and entry[0]() is image:
+            return entry[1]
+
+        content = blake2b(digest_size=16)
+        content.update(f"{image.mode}{image.size}".encode())
+        content.update(image.tobytes())
+        digest = content.hexdigest()
+
+        self._digests[key] = ref(image, lambda _, key=key: self._digests.pop(key, None)), digest
+        return digest
+
+    def derive(self, texture: arcade.Texture, transform: Hashable,
+               create: Callable[[Image.Image], Image.Image]) -> arcade.Texture:
+        """
+        Texture with the transformed image of the given texture.
+
+        :param transform: describes the transform, e.g. ``(Brightness(1.5),)``
+        :param create: applies the transform to the source image, only called on a cache miss
+        """
+        cached = self.lookup(texture, transform)
+        if cached is not None:
+            return cached
+        return self.store(texture, transform, create(texture.image))
+
+    def lookup(self, texture: arcade.Texture, transform: Hashable):
+        """Cached texture or None, counts hits and misses like :meth:`derive`"""
+        with self._lock:
+            key = self._digest(texture.image), _transform_key(transform)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def store(self, texture: arcade.Texture, transform: Hashable, image: Image.Image) -> arcade.Texture:
+        """Adds an image derived from the texture, which was computed outside of the cache"""
+        with self._lock:
+            digest = self._digest(texture.image)
+            # arcade identifies textures by name, equal names have to provide equal images
+            derived = arcade.Texture(name=f"{digest}_{transform}", image=image)
+
+            key = digest, _transform_key(transform)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.used_bytes -= previous[1]
+
+            size = _image_bytes(image)
+            if size <= self.budget:
+                while self._entries and self.used_bytes + size > self.budget:
+                    _, (_, released) = self._entries.popitem(last=False)
+                    self.used_bytes -= released
+                    self.evictions += 1
+
+                self._entries[key] = derived, size
+                self.used_bytes += size
+
+            return derived
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (f"UIDerivedTextureCache(entries={len(self._entries)}, used_bytes={self.used_bytes}, "
+                f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})")
+
+
+# process-wide cache used by the widgets
+derived_textures = UIDerivedTextureCache()
+
+
+# Transforms are applied to float32 RGBA values with shape (pixels, 4) and keep them within 0 to 255.
+# Channels are processed one at a time, numpy is slow on the short inner loop of all four.
+def _scale(values: np.ndarray, channels: Iterable[int], factor: float):
+    for channel in channels:
+        column = values[:, channel]
+        column *= factor
+        if not 0 <= factor <= 1:
+            np.clip(column, 0, 255, out=column)
+
+
+class Brightness(NamedTuple):
+    """Scales RGB, like PIL ImageEnhance.Brightness"""
+    factor: float
+
+    def apply(self, values: np.ndarray):
+        _scale(values, range(3), self.factor)
+
+
+class Tint(NamedTuple):
+    """Multiplies RGB with a color"""
+    color: Tuple[int, int, int]
+
+    def apply(self, values: np.ndarray):
+        for channel in range(3):
+            _scale(values, (channel,), np.float32(self.color[channel] / 255))
+
+
+class Alpha(NamedTuple):
+    """Scales the alpha channel"""
+    factor: float
+
+    def apply(self, values: np.ndarray):
+        _scale(values, (3,), self.factor)
+
+
+class Desaturate(NamedTuple):
+    """Moves RGB towards its luminance (ITU-R 601-2, like PIL "L" conversion), 1 is fully grey"""
+    amount: float = 1.0
+
+    def apply(self, values: np.ndarray):
+        # integer weights of PIL, sums stay below 2 ** 24 and are exact in float32
+        grey = values[:, 0] * 19595
+        grey += values[:, 1] * 38470
+        grey += values[:, 2] * 7471
+        grey += 0x8000
+        grey *= 1 / 65536
+        np.floor(grey, out=grey)
+
+        for channel in range(3):
+            if self.amount >= 1:
+                values[:, channel] = grey
+            else:
+                # like Image.blend
+                values[:, channel] += (grey - values[:, channel]) * self.amount
+
+
+# State variants of widget skins, transforms are applied in order
+STATE_TRANSFORMS = {
+    "hover": (Brightness(1.5),),
+    "pressed": (Brightness(0.5),),
+    "disabled": (Desaturate(), Alpha(0.5)),
+}
+
+Transforms = Tuple[NamedTuple, ...]
+
+# pixels transformed at once, the float values of a chunk stay in the CPU cache
+_CHUNK_PIXELS = 16 * 1024
+
+
+def _rgba(image: Image.Image) -> np.ndarray:
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    return np.asarray(image)
+
+
+def _groups(arrays: Sequence[np.ndarray]) -> Iterable[List[np.ndarray]]:
+    """Consecutive images with at least a chunk of pixels, the last group may be smaller"""
+    group: List[np.ndarray] = []
+    pixels = 0
+    for array in arrays:
+        group.append(array)
+        pixels += array.shape[0] * array.shape[1]
+        if pixels >= _CHUNK_PIXELS:
+            yield group
+            group, pixels = [], 0
+    if group:
+        yield group
+
+
+def transform_images(images: Sequence[Image.Image], variants: Sequence[Transforms]) -> List[List[Image.Image]]:
+    """
+    Applies each variant to all images.
+
+    Pixels of consecutive images are stacked into one array per group, which is transformed in chunks.
+    Each chunk is converted to float once and all variants are computed from it.
+    Values are truncated between transforms, like PIL does with 8-bit images.
+    Result images share the output buffer of their group, they are read-only until changed, which copies them.
+
+    :return: per variant a list with one RGBA image per source image
+    """
+    results: List[List[Image.Image]] = [[] for _ in variants]
+    source = np.empty((_CHUNK_PIXELS, 4), dtype=np.float32)
+    values = np.empty_like(source)
+
+    for group in _groups([_rgba(image) for image in images]):
+        pixels = np.concatenate([array.reshape(-1, 4) for array in group])
+        outputs = [np.empty_like(pixels) for _ in variants]
+
+        for start in range(0, len(pixels), _CHUNK_PIXELS):
+            chunk = pixels[start:start + _CHUNK_PIXELS]
+            chunk_source = source[:len(chunk)]
+            chunk_source[...] = chunk
+
+            for transforms, output in zip(variants, outputs):
+                chunk_values = values[:len(chunk)]
+                chunk_values[...] = chunk_source
+                for position, transform in enumerate(transforms):
+                    if position:
+                        np.floor(chunk_values, out=chunk_values)
+                    transform.apply(chunk_values)
+                # casting truncates
+                output[start:start + len(chunk)] = chunk_values
+
+        for output, result in zip(outputs, results):
+            offset = 0
+            for array in group:
+                height, width = array.shape[:2]
+                result.append(Image.frombuffer("RGBA", (width, height), output[offset:offset + height * width],
+                                               "raw", "RGBA", 0, 1))
+                offset += height * width
+
+    return results
+
+
+def derive(texture: arcade.Texture, transforms: Transforms) -> arcade.Texture:
+    """Variant of a single texture, cached in :data:`derived_textures`"""
+    return derived_textures.derive(
+        texture,
+        transforms,
+        lambda image: transform_images([image], [transforms])[0][0],
+    )
+
+
+def brightness(texture: arcade.Texture, factor: float) -> arcade.Texture:
+    """Brighter (factor > 1) or darker (factor < 1) variant of the texture"""
+    return derive(texture, (Brightness(factor),))
+
+
+def state_textures(textures: Sequence[arcade.Texture],
+                   states: Dict[str, Transforms] = None) -> List[Dict[str, arcade.Texture]]:
+    """
+    State variants (default :data:`STATE_TRANSFORMS`) of all textures.
+    Textures with variants missing in :data:`derived_textures` are transformed in one batch.
+
+    :return: per texture a dict of state name to texture
+    """
+    states = STATE_TRANSFORMS if states is None else states
+    results: List[Dict[str, arcade.Texture]] = []
+
+    # sources with missing variants, equal sources are only transformed once
+    missing: Dict[str, arcade.Texture] = {}
+    for texture in textures:
+        result = {}
+        for name, transforms in states.items():
+            cached = derived_textures.lookup(texture, transforms)
+            if cached is None:
+                missing.setdefault(derived_textures.digest(texture.image), texture)
+            else:
+                result[name] = cached
+        results.append(result)
+
+    if missing:
+        positions = {digest: position for position, digest in enumerate(missing)}
+        variants = transform_images([texture.image for texture in missing.values()], list(states.values()))
+
+        created = {}
+        for texture, result in zip(textures, results):
+            digest = derived_textures.digest(texture.image)
+            for index, (name, transforms) in enumerate(states.items()):
+                if name in result:
+                    continue
+                if (digest, name) not in created:
+                    image = variants[index][positions[digest]]
+                    created[digest, name] = derived_textures.store(texture, transforms, image)
+                result[name] = created[digest, name]
+
+    return results
+
+
+# Variants used by buttons
+BUTTON_STATES = {name: STATE_TRANSFORMS[name] for name in ("hover", "pressed")}
+
+
+class UIStateTextures:
+    """
+    Normal texture of a widget with its state variants (default :data:`STATE_TRANSFORMS`).
+
+    Lazy variants are created on first access, usually by ``do_render``. Otherwise all variants are created
+    on construction. The texture may be a :class:`v2_gui.assets.TextureHandle` which is still loading.
+    """
+
+    def __init__(self, texture: TextureLike, states: Dict[str, Transforms] = None, lazy=True):
+        self._normal = texture
+        self.states = STATE_TRANSFORMS if states is None else states
+        self._variants: Dict[str, arcade.Texture] = {}
+
+        if not lazy:
+            self.warm_up()
+
+    @property
+    def normal(self) -> arcade.Texture:
+        """Normal texture, waits for it if it is still loading"""
+        if isinstance(self._normal, TextureHandle):
+            self._normal = self._normal.texture
+        return self._normal
+
+    def __getitem__(self, state: str) -> arcade.Texture:
+        if state == "normal":
+            return self.normal
+
+        variant = self._variants.get(state)
+        if variant is None:
+            variant = self._variants[state] = derive(self.normal, self.states[state])
+        return variant
+
+    @property
+    def complete(self) -> bool:
+        """All variants are created"""
+        return len(self._variants) == len(self.states)
+
+    def warm_up(self):
+        """Creates all missing variants"""
+        warm_up([self])
+
+
+def warm_up(textures: Iterable[UIStateTextures]):
+    """Creates missing variants of all state textures, textures with equal states are handled in one batch"""
+    groups: Dict[int, List[UIStateTextures]] = {}
+    for item in textures:
+        if not item.complete:
+            groups.setdefault(id(item.states), []).append(item)
+
+    for group in groups.values():
+        variants = state_textures([item.normal for item in group], group[0].states)
+        for item, created in zip(group, variants):
+            # keep variants which were created in the meantime
+            for name, texture in created.items():
+                item._variants.setdefault(name, texture)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def warm_up_async(textures: Iterable[UIStateTextures]) -> Future:
+    """Runs :func:`warm_up` in a background thread, widgets can render meanwhile"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="texture-warm-up")
+    return _executor.submit(warm_up, list(textures))
@@ -1,10 +1,131 @@
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
 from typing import Optional, Tuple
 
 import arcade
 from arcade.gui import Surface, UIWidget, UIEvent
-from arcade.gui._property import _Property, _bind
+from arcade.gui._property import _Property
 from arcade.gui.widgets import _Rect
-from pyglet.event import EVENT_UNHANDLED
+from pyglet.event import EVENT_UNHANDLED, EVENT_HANDLED
+
+from v2_gui import profiler as _profiling
+from v2_gui.geometry_batch import UIGeometry, UIGeometryBatch
+from v2_gui.spatial_index import UISpatialIndex, ROUTED_EVENTS
+from v2_gui.surface import RenderStats, clip
+from v2_gui.texture_cache import UITextureCache
+
+# Used if widgets are rendered on a surface without stats
+_NO_STATS = RenderStats()
+
+# Routes of the mouse event currently dispatched by a UISpatialIndex
+_mouse_routes: Optional[dict] = None
+
+
+def _union(a: Optional[_Rect], b: Optional[_Rect]) -> Optional[_Rect]:
+    """Smallest rect containing both rects, ignores None"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    left = min(a.x, b.x)
+    bottom = min(a.y, b.y)
+    right = max(a.x + a.width, b.x + b.width)
+    top = max(a.y + a.height, b.y + b.height)
+    return _Rect(left, bottom, right - left, top - bottom)
+
+
+def _intersection(a: _Rect, b: _Rect) -> Optional[_Rect]:
+    """Overlapping area of both rects, None if they do not overlap"""
+    left = max(a.x, b.x)
+    bottom = max(a.y, b.y)
+    right = min(a.x + a.width, b.x + b.width)
+    top = min(a.y + a.height, b.y + b.height)
+    if right <= left or top <= bottom:
+        return None
+    return _Rect(left, bottom, right - left, top - bottom)
+
+
+class _RenderPass:
+    """State of a single render pass through a UIWidgetV2 tree"""
+    __slots__ = ("surface", "damage", "stats", "batch", "deferred")
+
+    def __init__(self, surface: Surface, damage: Optional[_Rect]):
+        self.surface = surface
+        self.damage = damage
+        self.stats: RenderStats = getattr(surface, "stats", _NO_STATS)
+        self.batch: Optional[UIGeometryBatch] = getattr(surface, "batch", None)
+        # widgets outside of the damage which requested a render on their own
+        self.deferred = []
+
+    def clip(self, area: _Rect):
+        """Clip to the area, only required while repairing damage"""
+        if self.damage is None:
+            return nullcontext()
+        return clip(self.surface, area)
+
+    def flush(self):
+        """Draw pending geometry, before anything else is drawn"""
+        if self.batch is not None and self.batch.flush(self.surface):
+            self.stats.draw_calls += 1
+
+
+def _contains(outer: _Rect, inner: _Rect) -> bool:
+    return (outer.x <= inner.x
+            and outer.y <= inner.y
+            and inner.x + inner.width <= outer.x + outer.width
+            and inner.y + inner.height <= outer.y + outer.height)
+
+
+class _RenderProperty(_Property):
+    """
+    _Property of :class:`UIWidgetV2`, which notifies the widget about changes before bound listeners.
+
+    If the widget uses a :class:`v2_gui.geometry_store.UIGeometryStore`,
+    values of stored properties are read from and written to the store.
+    """
+    __slots__ = ("stored",)
+
+    def __init__(self, default=None, stored=False):
+        super().__init__(default)
+        self.stored = stored
+
+    def get(self, instance):
+        store = instance._store
+        if store is not None and self.stored:
+            return store.get(self.name, instance._store_index)
+        return super().get(instance)
+
+    def set(self, instance, value):
+        store = instance._store
+        if store is not None and self.stored:
+            if store.get(self.name, instance._store_index) != value:
+                store.set(self.name, instance._store_index, value)
+                self.dispatch(instance, value)
+        else:
+            super().set(instance, value)
+
+    def dispatch(self, instance, value):
+        instance._on_property_change(self.name)
+
+        # an _Obs is only required, if listeners were bound
+        if instance in self.obs:
+            super().dispatch(instance, value)
+
+
+class _GeometryProperty(_RenderProperty):
+    """
+    Stored _RenderProperty which drops the cached content geometry of a :class:`UIWidgetV2`,
+    before bound listeners are notified.
+    """
+    __slots__ = ()
+
+    def __init__(self, default=None):
+        super().__init__(default, stored=True)
+
+    def dispatch(self, instance, value):
+        instance._content_rect = None
+        instance._content_size = None
+        super().dispatch(instance, value)
 
 
 class UIWidgetV2(UIWidget):
@@ -13,7 +134,31 @@ class UIWidgetV2(UIWidget):
 
     Further features:
     - Visible Flag to hide a widget and all children
+    - Damage tracking, changes only repaint the damaged region instead of the whole UI
+
+    Damage of a widget is merged into its UIWidgetV2 parents up to the topmost UIWidgetV2,
+    which clears and repaints only widgets intersecting the damaged region.
+    If the region can not be repaired locally (e.g. the widget moved outside of the topmost widget),
+    the full render of all parents is triggered as before.
+
+    Content geometry is cached and only recalculated after rect, border or padding changed.
+
+    For large amounts of widgets a :class:`v2_gui.geometry_store.UIGeometryStore` can be passed,
+    which keeps geometry and visibility in numpy arrays and provides vectorized calculations.
 
+    With :meth:`enable_spatial_index` mouse events are only passed to widgets under the cursor.
+
+    Rendered on a :class:`v2_gui.surface.UISurfaceV2`, background, border and the plain content of
+    UIWidgetV2 are collected as :class:`UIGeometry` and drawn with one draw call per pass.
+    The geometry of a widget is cached until one of its properties changes.
+    Subclasses overriding :meth:`do_render` are still drawn immediately, the batch is flushed before.
+
+    With ``cache_as_texture`` the subtree is rendered into an offscreen texture of the surface,
+    which is drawn instead until the widget or a descendant changes.
+    Cached subtrees are limited to the rect of the widget.
+
+    Property changes are coalesced, changes which are already covered by pending damage
+    do not notify parents again. Use :meth:`batch` to combine multiple changes into one notification.
 
     Todo:
     - Enable/Disable
@@ -22,32 +167,130 @@ class UIWidgetV2(UIWidget):
     - Focused (UIWidget got focus e.g. UIInputText, Tab order) [for now use hover]
 
     """
-    rect: _Rect = _Property(_Rect(0, 0, 1, 1))
-    visible = _Property(True)
-    border_width = _Property(0)
-    border_color = _Property(arcade.color.BLACK)
-    bg_color = _Property(None)
-    padding_top = _Property(0)
-    padding_right = _Property(0)
-    padding_bottom = _Property(0)
-    padding_left = _Property(0)
-
-    def __init__(self, **kwargs):
+    rect: _Rect = _GeometryProperty(_Rect(0, 0, 1, 1))
+    visible = _RenderProperty(True, stored=True)
+    border_width = _GeometryProperty(0)
+    border_color = _RenderProperty(arcade.color.BLACK)
+    bg_color = _RenderProperty(None)
+    padding_top = _GeometryProperty(0)
+    padding_right = _GeometryProperty(0)
+    padding_bottom = _GeometryProperty(0)
+    padding_left = _GeometryProperty(0)
+    cache_as_texture = _RenderProperty(False)
+
+    # cached geometry, dropped by _GeometryProperty
+    _content_rect: Optional[_Rect] = None
+    _content_size: Optional[Tuple[float, float]] = None
+
+    # damage tracking
+    _damage: Optional[_Rect] = None
+    _painted_rect: Optional[_Rect] = None
+
+    # property change coalescing
+    _batch_depth = 0
+    _batch_changes = 0
+    _frame_suppressed = 0
+    notification_count = 0
+    suppressed_notification_count = 0
+
+    # optional UIGeometryStore
+    _store = None
+    _store_index = -1
+    _parent = None
+
+    # children are culled to the content rect, disable for widgets rendering children outside of it
+    clip_children = True
+
+    # texture of the subtree has to be rendered again, see cache_as_texture
+    _texture_stale = True
+
+    # cached background, border and content geometry
+    _geometry: Optional[UIGeometry] = None
+
+    # UISpatialIndex this widget is indexed by
+    _spatial_index: Optional[UISpatialIndex] = None
+
+    def __init__(self, geometry_store=None, **kwargs):
+        if geometry_store is not None:
+            geometry_store.add(self)
+
         super().__init__(**kwargs)
 
         # workaround for UIWidget._rect
         # self.rect = self._rect
 
-        # TODO bind all _Properties to self.trigger_full_render
-        _bind(self, "rect", self.trigger_full_render)
-        _bind(self, "visible", self.trigger_full_render)
-        _bind(self, "border_width", self.trigger_full_render)
-        _bind(self, "border_color", self.trigger_full_render)
-        _bind(self, "bg_color", self.trigger_full_render)
-        _bind(self, "padding_top", self.trigger_full_render)
-        _bind(self, "padding_right", self.trigger_full_render)
-        _bind(self, "padding_bottom", self.trigger_full_render)
-        _bind(self, "padding_left", self.trigger_full_render)
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, value):
+        self._parent = value
+        if self._store is not None:
+            self._store.set_parent(self._store_index, value)
+
+    def _on_property_change(self, name: str):
+        """Called for every change of a _RenderProperty"""
+        self._geometry = None
+
+        profiler = _profiling._active
+        if profiler is not None:
+            profiler.property_changed(self, name)
+
+        index = self._spatial_index
+        if index is not None:
+            if name == "visible":
+                index.invalidate()
+            elif name == "rect":
+                index.mark_stale(self)
+
+        if self._batch_depth:
+            self._batch_changes += 1
+            return
+
+        self._notify_change()
+
+    def _notify_change(self):
+        """Triggers a full render, unless the change is already covered by pending damage"""
+        # pending damage already covers the current area, parents know about it
+        damage = self._damage
+        if (damage is not None
+                and _contains(damage, self.rect)
+                and (isinstance(self.parent, UIWidgetV2) or self._can_repair(damage))):
+            self.suppressed_notification_count += 1
+            self._frame_suppressed += 1
+
+            profiler = _profiling._active
+            if profiler is not None:
+                profiler.notification_suppressed(self)
+            return
+
+        self.notification_count += 1
+        self.trigger_full_render()
+
+    @contextmanager
+    def batch(self):
+        """
+        Collects all property changes within the context and notifies about them once afterwards.
+
+        .. code:: py
+
+            with widget.batch():
+                widget.padding = 10
+                widget.border_width = 2
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_changes:
+                suppressed = self._batch_changes - 1
+                self._batch_changes = 0
+                self.suppressed_notification_count += suppressed
+                self._frame_suppressed += suppressed
+
+                self._notify_change()
 
     # workaround for UIWidget._rect
     @property
@@ -73,35 +316,48 @@ class UIWidgetV2(UIWidget):
 
     @padding.setter
     def padding(self, value):
-        self.padding_top = value
-        self.padding_right = value
-        self.padding_bottom = value
-        self.padding_left = value
+        with self.batch():
+            self.padding_top = value
+            self.padding_right = value
+            self.padding_bottom = value
+            self.padding_left = value
 
     @property
     def content_size(self):
-        return self.content_width, self.content_height
+        content_size = self._content_size
+        if content_size is None:
+            content_rect = self.content_rect
+            content_size = self._content_size = content_rect.width, content_rect.height
+        return content_size
 
     @property
     def content_width(self):
-        return self.rect.width - 2 * self.border_width - self.padding_left - self.padding_right
+        return self.content_rect.width
 
     @property
     def content_height(self):
-        return self.rect.height - 2 * self.border_width - self.padding_top - self.padding_bottom
+        return self.content_rect.height
 
     @property
     def content_rect(self):
-        return _Rect(
-            self.left + self.border_width + self.padding_left,
-            self.bottom + self.border_width + self.padding_bottom,
-            self.content_width,
-            self.content_height
-        )
+        content_rect = self._content_rect
+        if content_rect is None:
+            x, y, width, height = self.rect
+            border_width = self.border_width
+            padding_left = self.padding_left
+            padding_bottom = self.padding_bottom
+            content_rect = self._content_rect = _Rect(
+                x + border_width + padding_left,
+                y + border_width + padding_bottom,
+                width - 2 * border_width - padding_left - self.padding_right,
+                height - 2 * border_width - self.padding_top - padding_bottom
+            )
+        return content_rect
 
     def with_border(self, width=2, color=(0, 0, 0)):
-        self.border_width = width
-        self.border_color = color
+        with self.batch():
+            self.border_width = width
+            self.border_color = color
 
     def with_space_around(self,
                           top: float = 0,
@@ -109,26 +365,296 @@ class UIWidgetV2(UIWidget):
                           bottom: float = 0,
                           left: float = 0,
                           bg_color: Optional[arcade.Color] = None):
-        self.padding_top = top
-        self.padding_right = right
-        self.padding_bottom = bottom
-        self.padding_left = left
-        self.bg_color = bg_color
+        with self.batch():
+            self.padding_top = top
+            self.padding_right = right
+            self.padding_bottom = bottom
+            self.padding_left = left
+            self.bg_color = bg_color
+
+    def trigger_render(self):
+        """
+        Marks the area of this widget as damaged, the area will be repainted before the next frame.
+        """
+        self._rendered = False
+
+        # children which are no UIWidgetV2 might have changed
+        if self._spatial_index is not None:
+            self._spatial_index.mark_stale(self)
+
+        self._add_damage(_union(self._painted_rect, self.rect))
+
+    def trigger_full_render(self):
+        """Damage covers the last painted and the current area, so parents are repainted where required"""
+        profiler = _profiling._active
+        if profiler is not None:
+            profiler.full_render_triggered(self)
+
+        self.trigger_render()
+
+    def _add_damage(self, rect: Optional[_Rect]):
+        """Merge damage into this widget and pass it to the UIWidgetV2 parent"""
+        if rect is None:
+            return
+
+        # nothing of the hidden subtree is painted, so there is nothing to repair
+        if not self.visible and self._painted_rect is None and self._damage is None:
+            return
+
+        self._damage = _union(self._damage, rect)
+        self._texture_stale = True
+
+        parent = self.parent
+        if isinstance(parent, UIWidgetV2):
+            parent._add_damage(rect)
+        elif not self._can_repair(self._damage):
+            # fallback, request a full render of all parents
+            for parent in self._walk_parents():
+                parent.trigger_render()
+
+    def _can_repair(self, damage: _Rect) -> bool:
+        """
+        Checks if the topmost UIWidgetV2 can repaint the damage on its own.
+        Clearing the region must not remove anything drawn by other widgets.
+        """
+        if not _contains(self.rect, damage):
+            return False
+
+        # parent is the UIManager, which would just clear the surface
+        if not isinstance(self.parent, UIWidget):
+            return True
+
+        return self.visible and bool(self.bg_color)
 
     def _do_render(self, surface: Surface, force=False):
         """Helper function to trigger :meth:`UIWidget.do_render` through the widget tree,
         should only be used by UIManager!
+
+        Without force only widgets within the damaged region are repainted.
         """
-        should_render = force or not self._rendered
-        if should_render and self.visible:
-            self.do_render_base(surface)
-            self.do_render(surface)
-            self._rendered = True
+        damage = self._damage
+
+        surface_rect = _Rect(0, 0, *surface.size)
+
+        if force:
+            render_pass = _RenderPass(surface, None)
+            self._render_tree(render_pass, surface_rect)
+            render_pass.flush()
+        elif damage:
+            render_pass = _RenderPass(surface, damage)
+            with clip(surface, damage):
+                surface.limit(*damage)
+                surface.clear()
+                self._render_tree(render_pass, surface_rect)
+                render_pass.flush()
+
+            for child in render_pass.deferred:
+                child._do_render(surface)
+        elif self.visible:
+            # children render on the surface directly, the cached texture is outdated afterwards
+            if self.cache_as_texture and not self._texture_stale and self._has_unrendered_descendants():
+                self._texture_stale = True
 
-        # only render children if self is visible
-        if self.visible:
             for child in self.children:
-                child._do_render(surface, should_render)
+                child._do_render(surface)
+
+    def _render_tree(self, render_pass: _RenderPass, clip_rect: _Rect):
+        """
+        Renders this widget and its children, limited to the damage of the render pass.
+
+        Subtrees outside of the clip rect (surface and content rects of ancestors) are culled.
+        """
+        self._damage = None
+        stats = render_pass.stats
+        stats.suppressed_notifications += self._frame_suppressed
+        self._frame_suppressed = 0
+
+        # only render self and children if self is visible
+        if not self.visible:
+            self._painted_rect = None
+            return
+
+        rect = self.rect
+        visible_rect = _intersection(rect, clip_rect)
+        if visible_rect is None:
+            # outside of the surface or clipped by a parent, also covers zero area rects
+            self._painted_rect = None
+            self._discard_damage(stats)
+            stats.culled_widgets += 1
+            return
+
+        if self.cache_as_texture:
+            cache = getattr(render_pass.surface, "texture_cache", None)
+            if cache is not None and self._render_cached(render_pass, cache):
+                return
+
+        self._render_subtree(render_pass, visible_rect)
+
+    def _render_subtree(self, render_pass: _RenderPass, visible_rect: _Rect):
+        """Renders this widget and its children, visible rect is the part within the clip rect"""
+        stats = render_pass.stats
+        surface = render_pass.surface
+        damage = render_pass.damage
+        batch = render_pass.batch
+        rect = self.rect
+
+        area = rect if damage is None else _intersection(rect, damage)
+        if area:
+            profiler = _profiling._active
+            if profiler is not None:
+                start = perf_counter()
+
+            if batch is None:
+                has_content = self._has_content()
+                with render_pass.clip(area):
+                    self.do_render_base(surface)
+                    if profiler is not None:
+                        base_end = perf_counter()
+                    if has_content:
+                        self.do_render(surface)
+                stats.draw_calls += bool(self.bg_color) + bool(self.border_width and self.border_color) + has_content
+            else:
+                batch.add(self.render_geometry())
+                if profiler is not None:
+                    base_end = perf_counter()
+                if _renders_immediately(type(self)) and self._has_content():
+                    render_pass.flush()
+                    with render_pass.clip(area):
+                        self.do_render(surface)
+                    stats.draw_calls += 1
+
+            if profiler is not None:
+                profiler.rendered(self, start, base_end, perf_counter())
+
+            self._rendered = True
+            self._painted_rect = rect
+            stats.redrawn_widgets += 1
+
+        clip_rect = visible_rect
+        if self.clip_children:
+            clip_rect = _intersection(visible_rect, self.content_rect)
+            if clip_rect is None:
+                for child in self.children:
+                    if isinstance(child, UIWidgetV2):
+                        child._discard_damage(stats)
+                stats.culled_widgets += len(self.children)
+                return
+
+        for child in self.children:
+            if isinstance(child, UIWidgetV2):
+                child._render_tree(render_pass, clip_rect)
+                continue
+
+            if _intersection(child.rect, clip_rect) is None:
+                stats.culled_widgets += 1
+                continue
+
+            area = child.rect if damage is None else _intersection(child.rect, damage)
+            if area:
+                render_pass.flush()
+                profiler = _profiling._active
+                if profiler is not None:
+                    start = perf_counter()
+                with render_pass.clip(area):
+                    child._do_render(surface, True)
+                if profiler is not None:
+                    # widgets which are no UIWidgetV2 do not split base and content
+                    profiler.rendered(child, start, start, perf_counter())
+                stats.draw_calls += 1
+            else:
+                render_pass.deferred.append(child)
+
+    def _render_cached(self, render_pass: _RenderPass, cache: UITextureCache) -> bool:
+        """
+        Draws the subtree from the texture cache, the texture is rendered first if required.
+        Returns False if the subtree does not fit into the cache.
+        """
+        surface = render_pass.surface
+        rect = self.rect
+        damage = render_pass.damage
+        area = rect if damage is None else _intersection(rect, damage)
+        if not area:
+            # outside of the damage, texture is rendered when it is drawn the next time
+            return True
+
+        offscreen = cache.get(self)
+        if offscreen is None or self._texture_stale or offscreen.size != (rect.width, rect.height):
+            offscreen = cache.acquire(self, (rect.width, rect.height), surface.create_offscreen)
+            if offscreen is None:
+                return False
+            self._rasterize(offscreen)
+
+        render_pass.flush()
+        with render_pass.clip(area):
+            surface.limit(0, 0, *surface.size)
+            offscreen.position = rect.x, rect.y
+            offscreen.draw()
+        render_pass.stats.draw_calls += 1
+        render_pass.stats.cached_subtrees += 1
+
+        self._rendered = True
+        self._painted_rect = rect
+        return True
+
+    def _rasterize(self, offscreen):
+        """Renders the subtree into the offscreen surface, which covers the rect of this widget"""
+        rect = self.rect
+        offscreen.origin = rect.x, rect.y
+
+        render_pass = _RenderPass(offscreen, None)
+        with offscreen.activate():
+            offscreen.clear()
+            self._render_subtree(render_pass, rect)
+            render_pass.flush()
+
+        self._texture_stale = False
+
+    def _has_unrendered_descendants(self) -> bool:
+        """Checks for widgets which are no UIWidgetV2 and requested a render on their own"""
+        stack = list(self.children)
+        while stack:
+            child = stack.pop()
+            if not isinstance(child, UIWidgetV2) and not child._rendered:
+                return True
+            stack.extend(child.children)
+        return False
+
+    def _has_content(self) -> bool:
+        """False if border and padding leave no space for content"""
+        width, height = self.content_size
+        return width > 0 and height > 0
+
+    def _discard_damage(self, stats: RenderStats):
+        """Drops pending damage of a culled subtree, damage of children is always part of the parents damage"""
+        if self._damage is None and not self._frame_suppressed:
+            return
+
+        self._damage = None
+        stats.suppressed_notifications += self._frame_suppressed
+        self._frame_suppressed = 0
+        for child in self.children:
+            if isinstance(child, UIWidgetV2):
+                child._discard_damage(stats)
+
+    def render_geometry(self) -> UIGeometry:
+        """
+        Background, border and the plain content of this widget as :class:`UIGeometry` in surface coordinates.
+        The geometry is cached until a property of the widget changes.
+        """
+        geometry = self._geometry
+        if geometry is None:
+            geometry = self._geometry = UIGeometry()
+
+            if self.bg_color:
+                geometry.add_rect(self.rect, self.bg_color)
+
+            if self.border_width and self.border_color:
+                geometry.add_outline(self.rect, self.border_width, self.border_color)
+
+            if not _renders_immediately(type(self)) and self._has_content():
+                geometry.add_rect(self.content_rect, arcade.color.WINE)
+
+        return geometry
 
     def do_render_base(self, surface: Surface):
         surface.limit(*self.rect)
@@ -147,12 +673,113 @@ class UIWidgetV2(UIWidget):
         surface.limit(*self.content_rect)
 
     def do_render(self, surface: Surface):
+        """Plain content, part of :meth:`render_geometry` if rendered with a geometry batch"""
         self.prepare_render(surface)
         arcade.draw_xywh_rectangle_filled(0, 0, self.content_width, self.content_height, color=arcade.color.WINE)
 
+    def enable_spatial_index(self, cell_size: int = 64) -> UISpatialIndex:
+        """
+        Index the rects of all widgets within this subtree in a :class:`UISpatialIndex`.
+        Mouse events passed to this widget are then only routed to widgets close to the cursor.
+        """
+        self.disable_spatial_index()
+        index = UISpatialIndex(self, cell_size=cell_size)
+        index.invalidate()
+        self._spatial_index = index
+        return index
+
+    def disable_spatial_index(self):
+        index = self._spatial_index
+        if index is not None and index.root is self:
+            index.detach()
+        self._spatial_index = None
+
+    def add(self, child, **kwargs):
+        child = super().add(child, **kwargs)
+        if self._spatial_index is not None:
+            self._spatial_index.invalidate()
+        return child
+
+    def insert(self, index: int, *children):
+        """
+        Adds children at the given position of the child list, in one step.
+        :meth:`add` with an index always appends and layouts lay out again after every added child.
+        """
+        for child in children:
+            child.parent = self
+        self.children[index:index] = children
+        self.trigger_full_render()
+        if self._spatial_index is not None:
+            self._spatial_index.invalidate()
+        return children
+
+    def remove(self, child):
+        super().remove(child)
+        if self._spatial_index is not None:
+            self._spatial_index.invalidate()
+
+    def clear(self):
+        super().clear()
+        if self._spatial_index is not None:
+            self._spatial_index.invalidate()
+
     def on_event(self, event: UIEvent) -> Optional[bool]:
         """Passes :class:`UIEvent` s through the widget tree."""
-        if self.visible:
-            return super(UIWidgetV2, self).on_event(event)
-        else:
+        global _mouse_routes
+
+        if not self.visible:
+            return EVENT_UNHANDLED
+
+        if isinstance(event, ROUTED_EVENTS):
+            index = self._spatial_index
+            if index is not None and index.root is self:
+                previous_routes = _mouse_routes
+                _mouse_routes = index.routes(event)
+                try:
+                    return self._route_event(event)
+                finally:
+                    _mouse_routes = previous_routes
+
+            if _mouse_routes is not None:
+                return self._route_event(event)
+
+        return super(UIWidgetV2, self).on_event(event)
+
+    def _route_event(self, event: UIEvent) -> Optional[bool]:
+        """Passes a mouse event only to children on the route to a widget under the cursor"""
+        children = _mouse_routes.get(self)
+        if children is None:
+            # no widget close to the cursor within this subtree
             return EVENT_UNHANDLED
+
+        if not _passes_events_to_children_only(type(self)):
+            # subclass handles the event itself, so pass it through the whole subtree
+            return super(UIWidgetV2, self).on_event(event)
+
+        for child in children:
+            if child.dispatch_event("on_event", event):
+                return EVENT_HANDLED
+        return EVENT_UNHANDLED
+
+
+_children_only_cache = {}
+_immediate_cache = {}
+
+
+def _renders_immediately(cls) -> bool:
+    """Checks if a subclass overrides the plain content rendering of UIWidgetV2"""
+    result = _immediate_cache.get(cls)
+    if result is None:
+        result = _immediate_cache[cls] = cls.do_render is not UIWidgetV2.do_render
+    return result
+
+
+def _passes_events_to_children_only(cls) -> bool:
+    """Checks if the on_event implementation following UIWidgetV2 within the mro is the plain UIWidget one"""
+    result = _children_only_cache.get(cls)
+    if result is None:
+        mro = cls.__mro__
+        following = mro[mro.index(UIWidgetV2) + 1:]
+        implementation = next(klass.__dict__["on_event"] for klass in following if "on_event" in klass.__dict__)
+        result = _children_only_cache[cls] = implementation is UIWidget.__dict__["on_event"]
+    return result